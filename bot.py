@@ -4,8 +4,9 @@ import os
 import logging
 import sys
 import asyncio
+import weakref
 from dotenv import load_dotenv
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.ext import Application, BaseUpdateProcessor, CommandHandler, MessageHandler, filters
 from telegram.error import InvalidToken
 import db
 import scheduler
@@ -18,6 +19,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Updates from different chats handled at the same time
+MAX_CONCURRENT_UPDATES = 64
+
+class PerChatUpdateProcessor(BaseUpdateProcessor):
+    """Process updates from different chats concurrently, but each chat's updates in order.
+
+    A slow handler (a surprise upload, a PDF export, a voice transcription) then only
+    delays the chat it came from instead of every chat using the bot.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        # chat_id -> lock; a chat's lock disappears once no update of that chat is pending
+        self._chat_locks = weakref.WeakValueDictionary()
+
+    async def process_update(self, update, coroutine):
+        chat = getattr(update, 'effective_chat', None)
+        if chat is None:
+            await super().process_update(update, coroutine)
+            return
+
+        lock = self._chat_locks.get(chat.id)
+        if lock is None:
+            lock = self._chat_locks[chat.id] = asyncio.Lock()
+        # Wait for the chat's turn before taking one of the concurrency slots, so a burst
+        # from one chat queues on its own lock instead of filling every slot
+        async with lock:
+            await super().process_update(update, coroutine)
+
+    async def do_process_update(self, update, coroutine):
+        await coroutine
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
 def main():
     """Main bot function."""
 
@@ -42,7 +81,12 @@ def main():
         logger.info("✅ Scheduler initialized")
 
         # Create application
-        application = Application.builder().token(token).build()
+        application = (
+            Application.builder()
+            .token(token)
+            .concurrent_updates(PerChatUpdateProcessor(MAX_CONCURRENT_UPDATES))
+            .build()
+        )
 
         # Register command handlers
         application.add_handler(CommandHandler("start", handlers.start_command))
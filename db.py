@@ -1,8 +1,12 @@
 import sqlite3
 import logging
+import sys
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Optional
 import unicodedata
+from zoneinfo import ZoneInfo
 from migrations import MigrationManager
 
 logger = logging.getLogger(__name__)
@@ -21,6 +25,9 @@ else:  # Local development
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 os.makedirs(GALLERY_PATH, exist_ok=True)
 
+# All reminder datetimes are stored and compared in Buenos Aires time
+BA_TZ = ZoneInfo('America/Argentina/Buenos_Aires')
+
 def init_db():
     """Initialize the database and run migrations."""
     # Run migrations first
@@ -101,8 +108,7 @@ def get_active_reminders(chat_id: int) -> List[Dict]:
         dt = datetime.fromisoformat(row[2])
         if dt.tzinfo is None:
             # Assume Buenos Aires timezone for naive datetimes
-            import pytz
-            dt = pytz.timezone('America/Argentina/Buenos_Aires').localize(dt)
+            dt = dt.replace(tzinfo=BA_TZ)
 
         reminders.append({
             'id': row[0],
@@ -117,11 +123,8 @@ def get_active_reminders(chat_id: int) -> List[Dict]:
 
 def get_today_reminders(chat_id: int) -> List[Dict]:
     """Get all active and sent reminders for today for a chat."""
-    import pytz
-
     # Get today's date range in Buenos Aires timezone
-    timezone = pytz.timezone('America/Argentina/Buenos_Aires')
-    now = datetime.now(timezone)
+    now = datetime.now(BA_TZ)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
 
@@ -157,12 +160,10 @@ def get_week_reminders(chat_id: int, include_sent: bool = False) -> List[Dict]:
         chat_id: The chat ID
         include_sent: If True, include sent reminders. If False, only active reminders.
     """
-    import pytz
     from datetime import timedelta
 
     # Get this week's date range in Buenos Aires timezone
-    timezone = pytz.timezone('America/Argentina/Buenos_Aires')
-    now = datetime.now(timezone)
+    now = datetime.now(BA_TZ)
 
     # Get start of week (Monday)
     days_since_monday = now.weekday()
@@ -233,12 +234,9 @@ def search_reminders(chat_id: int, keyword: str) -> List[Dict]:
 
 def get_date_reminders(chat_id: int, target_date: datetime) -> List[Dict]:
     """Get all active reminders for a specific date."""
-    import pytz
-
     # Ensure target_date has timezone info
     if target_date.tzinfo is None:
-        timezone = pytz.timezone('America/Argentina/Buenos_Aires')
-        target_date = timezone.localize(target_date)
+        target_date = target_date.replace(tzinfo=BA_TZ)
 
     # Get date range for the target day
     day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -325,8 +323,7 @@ def get_all_active_reminders() -> List[Dict]:
         dt = datetime.fromisoformat(row[3])
         if dt.tzinfo is None:
             # Assume Buenos Aires timezone for naive datetimes
-            import pytz
-            dt = pytz.timezone('America/Argentina/Buenos_Aires').localize(dt)
+            dt = dt.replace(tzinfo=BA_TZ)
 
         reminders.append({
             'id': row[0],
@@ -497,14 +494,23 @@ def search_vault_entries(chat_id: int, keyword: str) -> List[Dict]:
 
     return entries
 
+# str.translate table deleting every nonspacing mark (accents split off by NFD normalization)
+_NONSPACING_MARKS = {c: None for c in range(sys.maxunicode + 1) if unicodedata.category(chr(c)) == 'Mn'}
+
+# Shared with handlers.py. Searches re-normalize every stored entry, so the entries' texts keep coming back
+@lru_cache(maxsize=4096)
 def normalize_text_for_search(text: str) -> str:
     """Normalize text for search: remove accents, convert to lowercase."""
     if not text:
         return ""
 
-    # Remove accents/diacritics
+    # Plain ASCII has nothing to decompose
+    if text.isascii():
+        return text.lower()
+
+    # Remove accents/diacritics (combining marks left behind by NFD)
     normalized = unicodedata.normalize('NFD', text)
-    without_accents = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+    without_accents = normalized.translate(_NONSPACING_MARKS)
 
     # Convert to lowercase
     return without_accents.lower()
@@ -846,8 +852,7 @@ def get_all_user_reminders(chat_id: int, include_history: bool = True) -> List[D
         dt = datetime.fromisoformat(row[2])
         if dt.tzinfo is None:
             # Assume Buenos Aires timezone for naive datetimes
-            import pytz
-            dt = pytz.timezone('America/Argentina/Buenos_Aires').localize(dt)
+            dt = dt.replace(tzinfo=BA_TZ)
 
         reminders.append({
             'id': row[0],
@@ -1035,13 +1040,33 @@ def get_active_important_reminders() -> List[Dict]:
 
         # Ensure datetime has timezone info
         if reminder['datetime'].tzinfo is None:
-            import pytz
-            reminder['datetime'] = pytz.timezone('America/Argentina/Buenos_Aires').localize(reminder['datetime'])
+            reminder['datetime'] = reminder['datetime'].replace(tzinfo=BA_TZ)
 
         reminders.append(reminder)
 
     return reminders
 
+# Role flags only change on activation, so lookups are remembered for a while:
+# chat_id -> (flag, time.monotonic() of the lookup)
+_girlfriend_cache = {}
+_admin_cache = {}
+# Seconds a cached flag stays valid (also how long a manual DB edit can go unnoticed)
+_ROLE_CACHE_TTL = 300
+_ROLE_CACHE_MAX_SIZE = 10000
+
+def _get_cached_flag(cache: Dict, chat_id: int) -> Optional[bool]:
+    """Return a cached role flag for chat_id, or None if missing or expired."""
+    cached = cache.get(chat_id)
+    if cached and time.monotonic() - cached[1] < _ROLE_CACHE_TTL:
+        return cached[0]
+    return None
+
+def _set_cached_flag(cache: Dict, chat_id: int, flag: bool):
+    """Remember a role flag for chat_id."""
+    if len(cache) >= _ROLE_CACHE_MAX_SIZE:
+        cache.clear()
+    cache[chat_id] = (flag, time.monotonic())
+
 # Special girlfriend mode functions
 def set_girlfriend_mode(chat_id: int) -> bool:
     """Activate girlfriend mode for a specific chat_id."""
@@ -1057,6 +1082,7 @@ def set_girlfriend_mode(chat_id: int) -> bool:
     success = cursor.rowcount > 0
     conn.commit()
     conn.close()
+    _girlfriend_cache.pop(chat_id, None)
 
     if success:
         logger.info(f"Girlfriend mode activated for chat {chat_id}")
@@ -1065,6 +1091,10 @@ def set_girlfriend_mode(chat_id: int) -> bool:
 
 def is_girlfriend(chat_id: int) -> bool:
     """Check if chat_id has girlfriend mode activated."""
+    cached = _get_cached_flag(_girlfriend_cache, chat_id)
+    if cached is not None:
+        return cached
+
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
@@ -1077,6 +1107,7 @@ def is_girlfriend(chat_id: int) -> bool:
     result = cursor.fetchone()
     conn.close()
 
+    _set_cached_flag(_girlfriend_cache, chat_id, result is not None)
     return result is not None
 
 def set_admin_mode(chat_id: int) -> bool:
@@ -1093,6 +1124,7 @@ def set_admin_mode(chat_id: int) -> bool:
     success = cursor.rowcount > 0
     conn.commit()
     conn.close()
+    _admin_cache.pop(chat_id, None)
 
     if success:
         logger.info(f"Admin mode activated for chat {chat_id}")
@@ -1101,6 +1133,10 @@ def set_admin_mode(chat_id: int) -> bool:
 
 def is_admin(chat_id: int) -> bool:
     """Check if chat_id has admin mode activated."""
+    cached = _get_cached_flag(_admin_cache, chat_id)
+    if cached is not None:
+        return cached
+
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
@@ -1113,6 +1149,7 @@ def is_admin(chat_id: int) -> bool:
     result = cursor.fetchone()
     conn.close()
 
+    _set_cached_flag(_admin_cache, chat_id, result is not None)
     return result is not None
 
 # Secret gallery functions
@@ -1243,12 +1280,9 @@ def get_reminder_by_id(chat_id: int, reminder_id: int) -> dict:
 
 def get_all_date_reminders_including_past(chat_id: int, target_date: datetime) -> List[Dict]:
     """Get ALL reminders for a specific date, including sent and cancelled ones."""
-    import pytz
-
     # Ensure target_date has timezone info
     if target_date.tzinfo is None:
-        timezone = pytz.timezone('America/Argentina/Buenos_Aires')
-        target_date = timezone.localize(target_date)
+        target_date = target_date.replace(tzinfo=BA_TZ)
 
     # Get date range for the target day
     day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -1,16 +1,25 @@
+import os
 import re
+import html
+import hmac
+import hashlib
+import asyncio
+import time
+import random
 import logging
+import itertools
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Tuple, List
+import calendar
 import unicodedata
-import pytz
-import dateparser
+from dateparser.date import DateDataParser
 from telegram import Update
 from telegram.ext import ContextTypes
 import db
 import scheduler
-from transcription import transcriber
-from pdf_exporter import PDFExporter, cleanup_temp_file
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +30,92 @@ DATEPARSER_SETTINGS = {
     'DATE_ORDER': 'DMY',
     'DEFAULT_LANGUAGES': ['es']
 }
+# Only try the languages users actually write in; by default dateparser runs
+# language detection over every locale it ships, which dominates parse time
+DATEPARSER_LANGUAGES = ['es', 'en']
+
+# Settings for /dia, where dates may be in the past and day-only dates mean the 1st
+DATEPARSER_PAST_SETTINGS = {
+    'DATE_ORDER': 'DMY',
+    'PREFER_DAY_OF_MONTH': 'first',
+    'STRICT_PARSING': False,
+    'RETURN_AS_TIMEZONE_AWARE': True,
+    'TIMEZONE': 'America/Argentina/Buenos_Aires'
+}
+
+# dateparser.parse() builds a new DateDataParser (validating settings and
+# loading locales) on every call that passes languages, so build ours once
+_DATEPARSER = DateDataParser(languages=DATEPARSER_LANGUAGES, settings=DATEPARSER_SETTINGS)
+_DATEPARSER_PAST = DateDataParser(languages=DATEPARSER_LANGUAGES, settings=DATEPARSER_PAST_SETTINGS)
+
+def _get_date(parser: DateDataParser, text: str):
+    """Return the datetime parser finds in text, or None (like dateparser.parse)."""
+    data = parser.get_date_data(text)
+    return data['date_obj'] if data else None
+
+@lru_cache(maxsize=512)
+def _cached_dateparser_parse(text: str, minute_bucket: int):
+    """Memoized dateparser parse; minute_bucket keeps relative dates ('mañana', 'en 1h') fresh."""
+    return _get_date(_DATEPARSER, text)
+
+def _dateparser_parse(text: str):
+    """Parse text with dateparser and DATEPARSER_SETTINGS, reusing results within the same minute."""
+    return _cached_dateparser_parse(text, int(time.time() // 60))
+
+# Category keywords, checked in order by extract_category_from_text
+CATEGORY_KEYWORDS = [
+    # Work-related keywords
+    ('trabajo', ['trabajo', 'reunión', 'meeting', 'oficina', 'jefe', 'cliente', 'proyecto',
+                 'presentación', 'deadline', 'entrega', 'equipo', 'empresa', 'negocio']),
+    # Health-related keywords
+    ('salud', ['médico', 'doctor', 'dr.', 'dr ', 'hospital', 'clínica', 'turno', 'consulta',
+               'medicina', 'pastilla', 'tratamiento', 'análisis', 'estudio', 'salud',
+               'dentista', 'odontólogo', 'psicólogo', 'terapia', 'farmacia', 'receta']),
+    # Personal/family keywords
+    ('personal', ['cumpleaños', 'familia', 'mamá', 'papá', 'hermano', 'hermana', 'hijo',
+                  'hija', 'esposo', 'esposa', 'novio', 'novia', 'amigo', 'personal',
+                  'recomendó', 'recomienda', 'libro', 'sugiere', 'aconseja', 'le gusta',
+                  'prefiere', 'odia', 'le encanta']),
+    # Shopping/errands keywords
+    ('compras', ['comprar', 'supermercado', 'tienda', 'mercado', 'shopping', 'pagar',
+                 'banco', 'farmacia', 'ferretería', 'verdulería']),
+    # Entertainment keywords
+    ('entretenimiento', ['cine', 'película', 'teatro', 'concierto', 'partido', 'show',
+                         'restaurante', 'bar', 'fiesta', 'vacaciones', 'viaje', 'música',
+                         'banda', 'artista', 'baile', 'discoteca', 'pub', 'parrilla']),
+    # Home/maintenance keywords
+    ('hogar', ['casa', 'hogar', 'limpieza', 'limpiar', 'cocinar', 'cocina', 'jardín',
+               'plantas', 'mascotas', 'perro', 'gato', 'reparar', 'arreglar', 'filtro',
+               'aire acondicionado', 'calefacción', 'electricidad', 'plomería', 'mantenimiento']),
+]
+
+# All category keywords in one pattern, one capture group per category in priority order.
+# The zero-width lookahead reports every position where a keyword starts, with the
+# highest-priority category whose keyword starts there as match.lastindex.
+_CATEGORY_NAMES = [category for category, _ in CATEGORY_KEYWORDS]
+_CATEGORY_RE = re.compile('(?=' + '|'.join(
+    '(' + '|'.join(map(re.escape, keywords)) + ')' for _, keywords in CATEGORY_KEYWORDS
+) + ')')
+
+# Recently registered users: chat_id -> (user info, user_id, time.monotonic() of the DB write)
+_USER_CACHE = {}
+# Seconds before an unchanged user is written again (also how stale users.last_activity can get)
+_USER_CACHE_TTL = 300
+_USER_CACHE_MAX_SIZE = 10000
 
 def register_or_update_user(update: Update) -> int:
     """Register or update user information and return user_id."""
     user = update.effective_user
     chat_id = update.effective_chat.id
+    user_info = (user.username, user.first_name, user.last_name, user.is_bot, user.language_code or 'es')
 
-    return db.create_or_update_user(
+    # Skip the DB write if this user was just saved with the same information
+    cached = _USER_CACHE.get(chat_id)
+    now = time.monotonic()
+    if cached and cached[0] == user_info and now - cached[2] < _USER_CACHE_TTL:
+        return cached[1]
+
+    user_id = db.create_or_update_user(
         chat_id=chat_id,
         username=user.username,
         first_name=user.first_name,
@@ -36,23 +124,25 @@ def register_or_update_user(update: Update) -> int:
         language_code=user.language_code or 'es'
     )
 
+    if len(_USER_CACHE) >= _USER_CACHE_MAX_SIZE:
+        _USER_CACHE.clear()
+    _USER_CACHE[chat_id] = (user_info, user_id, now)
+    return user_id
+
 def capitalize_first_letter(text: str) -> str:
     """Capitalize the first letter of a text while preserving the rest."""
     if not text:
         return text
     return text[0].upper() + text[1:] if len(text) > 1 else text.upper()
 
-def normalize_text_for_search(text: str) -> str:
-    """Normalize text for search: remove accents, convert to lowercase."""
-    if not text:
-        return ""
-
-    # Remove accents/diacritics
-    normalized = unicodedata.normalize('NFD', text)
-    without_accents = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
-
-    # Convert to lowercase
-    return without_accents.lower()
+# Question words and common patterns ignored in conversational searches
+_QUESTION_WORDS = frozenset({
+    'que', 'quien', 'donde', 'cuando', 'como', 'por', 'para',
+    'le', 'les', 'me', 'te', 'se', 'nos', 'el', 'la', 'los', 'las',
+    'un', 'una', 'del', 'de', 'en', 'con', 'a',
+    'y', 'o', 'pero', 'si', 'no', 'mas', 'muy', 'tan', 'tanto'
+})
+_NON_WORD_RE = re.compile(r'[^\w]')
 
 def extract_conversational_search_terms(text: str) -> List[str]:
     """Extract search terms from conversational questions about people or topics.
@@ -63,29 +153,14 @@ def extract_conversational_search_terms(text: str) -> List[str]:
     - "dónde come Pedro?" → ["pedro", "come"]
     """
     # Normalize text for processing
-    normalized = normalize_text_for_search(text)
-
-    # Remove question words and common patterns
-    question_words = [
-        'que', 'quien', 'donde', 'cuando', 'como', 'por', 'para',
-        'le', 'les', 'me', 'te', 'se', 'nos', 'el', 'la', 'los', 'las',
-        'un', 'una', 'del', 'de', 'en', 'con', 'por', 'para', 'a',
-        'y', 'o', 'pero', 'si', 'no', 'mas', 'muy', 'tan', 'tanto'
-    ]
+    normalized = db.normalize_text_for_search(text)
 
-    # Split into words and filter
-    words = normalized.split()
-    search_terms = []
+    # Remove punctuation from each word, then skip short words and question words
+    clean_words = (_NON_WORD_RE.sub('', word) for word in normalized.split())
+    return [word for word in clean_words if len(word) >= 3 and word not in _QUESTION_WORDS]
 
-    for word in words:
-        # Remove punctuation
-        clean_word = re.sub(r'[^\w]', '', word)
-
-        # Skip if empty, too short, or is a question word
-        if len(clean_word) >= 3 and clean_word not in question_words:
-            search_terms.append(clean_word)
-
-    return search_terms
+# Pattern to match (categoría: X) or (categoria: X) at the end of the text - case insensitive
+_EXPLICIT_CATEGORY_RE = re.compile(r'\s*\(\s*categor[ií]a\s*:\s*([^)]+)\s*\)\s*$', re.IGNORECASE)
 
 def extract_explicit_category(text: str) -> Tuple[str, str]:
     """Extract explicit category from text pattern like '(categoría: trabajo)' or '(categoria: trabajo)'.
@@ -93,71 +168,68 @@ def extract_explicit_category(text: str) -> Tuple[str, str]:
     Returns:
         tuple: (cleaned_text, category) - text without the category pattern and the extracted category
     """
-    # Pattern to match (categoría: X) or (categoria: X) - case insensitive
-    pattern = r'\s*\(\s*categor[ií]a\s*:\s*([^)]+)\s*\)\s*$'
+    # Nearly all texts have no explicit category; skip the case-insensitive regex scan for them
+    if '(' not in text:
+        return text, None
 
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = _EXPLICIT_CATEGORY_RE.search(text)
     if match:
         category = match.group(1).strip().lower()
-        cleaned_text = re.sub(pattern, '', text, flags=re.IGNORECASE).strip()
+        cleaned_text = (text[:match.start()] + text[match.end():]).strip()
         return cleaned_text, category
 
     return text, None
 
 def extract_category_from_text(text: str) -> str:
     """Extract category from text based on keywords."""
-    text_lower = text.lower()
-
-    # Work-related keywords
-    work_keywords = ['trabajo', 'reunión', 'meeting', 'oficina', 'jefe', 'cliente', 'proyecto',
-                     'presentación', 'deadline', 'entrega', 'equipo', 'empresa', 'negocio']
-    if any(keyword in text_lower for keyword in work_keywords):
-        return 'trabajo'
-
-    # Health-related keywords
-    health_keywords = ['médico', 'doctor', 'dr.', 'dr ', 'hospital', 'clínica', 'turno', 'consulta',
-                       'medicina', 'pastilla', 'tratamiento', 'análisis', 'estudio', 'salud',
-                       'dentista', 'odontólogo', 'psicólogo', 'terapia', 'farmacia', 'receta']
-    if any(keyword in text_lower for keyword in health_keywords):
-        return 'salud'
-
-    # Personal/family keywords
-    personal_keywords = ['cumpleaños', 'familia', 'mamá', 'papá', 'hermano', 'hermana', 'hijo',
-                         'hija', 'esposo', 'esposa', 'novio', 'novia', 'amigo', 'personal',
-                         'recomendó', 'recomienda', 'libro', 'sugiere', 'aconseja', 'le gusta',
-                         'prefiere', 'odia', 'le encanta']
-    if any(keyword in text_lower for keyword in personal_keywords):
-        return 'personal'
-
-    # Shopping/errands keywords
-    shopping_keywords = ['comprar', 'supermercado', 'tienda', 'mercado', 'shopping', 'pagar',
-                        'banco', 'farmacia', 'ferretería', 'verdulería']
-    if any(keyword in text_lower for keyword in shopping_keywords):
-        return 'compras'
+    # Shortest keywords are 3 chars ('bar', 'pub', 'dr.'); skip the scans if nothing can match
+    if len(text) < 3 or not any(c.isalpha() for c in text):
+        return 'general'
+
+    # Single pass over the text, keeping the highest-priority category seen
+    best = None
+    for match in _CATEGORY_RE.finditer(text.lower()):
+        if best is None or match.lastindex < best:
+            best = match.lastindex
+            if best == 1:
+                break
 
-    # Entertainment keywords
-    entertainment_keywords = ['cine', 'película', 'teatro', 'concierto', 'partido', 'show',
-                             'restaurante', 'bar', 'fiesta', 'vacaciones', 'viaje', 'música',
-                             'banda', 'artista', 'baile', 'discoteca', 'pub', 'parrilla']
-    if any(keyword in text_lower for keyword in entertainment_keywords):
-        return 'entretenimiento'
-
-    # Home/maintenance keywords
-    home_keywords = ['casa', 'hogar', 'limpieza', 'limpiar', 'cocinar', 'cocina', 'jardín',
-                     'plantas', 'mascotas', 'perro', 'gato', 'reparar', 'arreglar', 'filtro',
-                     'aire acondicionado', 'calefacción', 'electricidad', 'plomería', 'mantenimiento']
-    if any(keyword in text_lower for keyword in home_keywords):
-        return 'hogar'
+    if best is not None:
+        return _CATEGORY_NAMES[best - 1]
 
     # Default category
     return 'general'
 
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle the /start command."""
-    # Register or update user
-    register_or_update_user(update)
+def prepare_entry_text(text: str) -> Tuple[str, str]:
+    """Prepare reminder or vault text: strip an explicit '(categoría: X)', capitalize and pick the category.
+
+    Returns:
+        tuple: (text, category) - the cleaned text and the explicit or keyword-detected category
+    """
+    text, explicit_category = extract_explicit_category(text)
+    text = capitalize_first_letter(text)
+    return text, explicit_category or extract_category_from_text(text)
 
-    message = """
+# Telegram rejects messages longer than this many characters
+_TELEGRAM_MESSAGE_LIMIT = 4096
+
+async def _send_chunked(reply_text, parts: List[str], parse_mode: str = 'HTML'):
+    """Send parts in as few messages as possible, splitting only between parts to stay under Telegram's limit."""
+    chunk = []
+    chunk_len = 0
+    for part in parts:
+        if chunk and chunk_len + len(part) > _TELEGRAM_MESSAGE_LIMIT:
+            await reply_text(''.join(chunk), parse_mode=parse_mode)
+            chunk = []
+            chunk_len = 0
+        chunk.append(part)
+        chunk_len += len(part)
+
+    if chunk:
+        await reply_text(''.join(chunk), parse_mode=parse_mode)
+
+# Welcome text sent by /start
+_START_MESSAGE = """
 🤖 **¡Hola! Soy tu asistente personal inteligente**
 
 Manejo tres funcionalidades principales:
@@ -223,7 +295,12 @@ Manejo tres funcionalidades principales:
 ¡Empezá a usar tu asistente personal! 🚀
     """
 
-    await update.message.reply_text(message)
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle the /start command."""
+    # Register or update user
+    register_or_update_user(update)
+
+    await update.message.reply_text(_START_MESSAGE)
 
 async def remind_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /recordar command."""
@@ -249,23 +326,25 @@ async def list_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("📝 No tienes recordatorios activos.")
         return
 
-    message = "📋 **Tus recordatorios activos:**\n\n"
+    parts = ["📋 <b>Tus recordatorios activos:</b>\n\n"]
 
     for reminder in reminders:
         formatted_date = reminder['datetime'].strftime("%d/%m/%Y %H:%M")
 
         # Use fire emoji for important reminders
-        if reminder.get('is_important', False):
+        if reminder['is_important']:
             emoji = "🔥"
-            repeat_info = f" (cada {reminder.get('repeat_interval', 5)}min)"
+            repeat_info = f" (cada {reminder['repeat_interval']}min)"
         else:
             emoji = "🔔"
             repeat_info = ""
 
-        message += f"{emoji} **#{reminder['id']}** - {formatted_date}{repeat_info}\n"
-        message += f"   {reminder['text']}\n\n"
+        parts.append(
+            f"{emoji} <b>#{reminder['id']}</b> - {formatted_date}{repeat_info}\n"
+            f"   {html.escape(reminder['text'])}\n\n"
+        )
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await _send_chunked(update.message.reply_text, parts)
 
 async def today_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /hoy command."""
@@ -276,7 +355,7 @@ async def today_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("📅 No tienes recordatorios para hoy.")
         return
 
-    message = "📅 **Tus recordatorios para hoy:**\n\n"
+    parts = ["📅 <b>Tus recordatorios para hoy:</b>\n\n"]
 
     for reminder in reminders:
         # Show only time for today's reminders (not date)
@@ -290,10 +369,15 @@ async def today_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             status_emoji = "🔔"
             status_text = ""
 
-        message += f"{status_emoji} **#{reminder['id']}** - {formatted_time} {status_text}\n"
-        message += f"   {reminder['text']}\n\n"
+        parts.append(
+            f"{status_emoji} <b>#{reminder['id']}</b> - {formatted_time} {status_text}\n"
+            f"   {html.escape(reminder['text'])}\n\n"
+        )
+
+    await _send_chunked(update.message.reply_text, parts)
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+# Spanish day names, indexed by datetime.weekday() (Monday=0)
+_DAY_NAMES = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo')
 
 async def week_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /semana command."""
@@ -314,12 +398,7 @@ async def week_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Group reminders by day
-    from collections import defaultdict
-    from datetime import datetime, timedelta
-    import pytz
-
-    timezone = pytz.timezone('America/Argentina/Buenos_Aires')
-    now = datetime.now(timezone)
+    now = datetime.now(db.BA_TZ)
 
     # Create a dict to group reminders by day
     days_reminders = defaultdict(list)
@@ -329,14 +408,11 @@ async def week_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         reminder_date = reminder['datetime'].date()
         days_reminders[reminder_date].append(reminder)
 
-    # Spanish day names
-    day_names = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
-
     # Set message header based on what we're showing
     if include_sent:
-        message = "📅 **Tus recordatorios de esta semana (todos):**\n\n"
+        parts = ["📅 <b>Tus recordatorios de esta semana (todos):</b>\n\n"]
     else:
-        message = "📅 **Tus recordatorios pendientes de esta semana:**\n\n"
+        parts = ["📅 <b>Tus recordatorios pendientes de esta semana:</b>\n\n"]
 
     # Get start of week (Monday)
     days_since_monday = now.weekday()
@@ -346,24 +422,25 @@ async def week_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     for i in range(7):
         current_day = week_start + timedelta(days=i)
         current_date = current_day.date()
-        day_name = day_names[i]
+        day_name = _DAY_NAMES[i]
 
         # Format date
-        formatted_date = current_day.strftime("%d/%m")
+        formatted_date = f"{current_day.day:02d}/{current_day.month:02d}"
 
         # Check if it's today
         if current_date == now.date():
-            day_header = f"**{day_name} {formatted_date} (HOY)**"
+            day_header = f"<b>{day_name} {formatted_date} (HOY)</b>"
         else:
-            day_header = f"**{day_name} {formatted_date}**"
+            day_header = f"<b>{day_name} {formatted_date}</b>"
 
         # Get reminders for this day
         day_reminders = days_reminders.get(current_date, [])
 
         if day_reminders:
-            message += f"{day_header}\n"
+            parts.append(f"{day_header}\n")
             for reminder in day_reminders:
-                formatted_time = reminder['datetime'].strftime("%H:%M")
+                reminder_datetime = reminder['datetime']
+                formatted_time = f"{reminder_datetime.hour:02d}:{reminder_datetime.minute:02d}"
 
                 # Show different emoji and text based on status
                 if reminder['status'] == 'sent':
@@ -373,17 +450,28 @@ async def week_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     status_emoji = "🔔"
                     status_text = ""
 
-                message += f"  {status_emoji} **#{reminder['id']}** - {formatted_time} {status_text}\n"
-                message += f"     {reminder['text']}\n"
-            message += "\n"
+                parts.append(
+                    f"  {status_emoji} <b>#{reminder['id']}</b> - {formatted_time} {status_text}\n"
+                    f"     {html.escape(reminder['text'])}\n"
+                )
+            parts.append("\n")
         else:
             # Only show empty days if they haven't passed yet or are today
             if current_date >= now.date():
-                message += f"{day_header}\n"
-                message += f"  _Sin recordatorios_\n\n"
+                parts.append(
+                    f"{day_header}\n"
+                    f"  <i>Sin recordatorios</i>\n\n"
+                )
+
+    await _send_chunked(update.message.reply_text, parts)
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+def _strip_quotes(text: str) -> str:
+    """Remove a matching pair of surrounding single or double quotes."""
+    if text and text[0] in ('"', "'") and text[-1] == text[0]:
+        return text[1:-1]
+    return text
 
+@lru_cache(maxsize=256)
 def parse_search_query(query: str) -> Tuple[str, bool]:
     """Parse search query to detect category search.
 
@@ -391,7 +479,7 @@ def parse_search_query(query: str) -> Tuple[str, bool]:
         tuple: (search_term, is_category_search)
     """
     # Check for category: pattern
-    if query.startswith('categoria:') or query.startswith('categoría:'):
+    if query.startswith(('categoria:', 'categoría:')):
         category = query.split(':', 1)[1].strip()
         return category, True
 
@@ -419,8 +507,7 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     keyword = ' '.join(context.args)
 
     # Remove quotes if present
-    if (keyword.startswith('"') and keyword.endswith('"')) or (keyword.startswith("'") and keyword.endswith("'")):
-        keyword = keyword[1:-1]
+    keyword = _strip_quotes(keyword)
 
     if not keyword.strip():
         await update.message.reply_text("❌ La búsqueda no puede estar vacía.")
@@ -441,23 +528,25 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     if is_category:
-        message = f"🔍 **Recordatorios de categoría \"{search_term}\":**\n\n"
+        parts = [f"🔍 <b>Recordatorios de categoría \"{html.escape(search_term)}\":</b>\n\n"]
     else:
-        message = f"🔍 **Recordatorios encontrados con \"{search_term}\":**\n\n"
+        parts = [f"🔍 <b>Recordatorios encontrados con \"{html.escape(search_term)}\":</b>\n\n"]
 
     for reminder in reminders:
         formatted_date = reminder['datetime'].strftime("%d/%m/%Y %H:%M")
 
         # Highlight the keyword in the text (simple bold formatting) - only for text search
         if is_category:
-            highlighted_text = reminder['text']
+            highlighted_text = html.escape(reminder['text'])
         else:
             highlighted_text = _highlight_keyword(reminder['text'], search_term)
 
-        message += f"🔔 **#{reminder['id']}** - {formatted_date}\n"
-        message += f"   {highlighted_text}\n\n"
+        parts.append(
+            f"🔔 <b>#{reminder['id']}</b> - {formatted_date}\n"
+            f"   {highlighted_text}\n\n"
+        )
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await _send_chunked(update.message.reply_text, parts)
 
 async def date_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /dia command."""
@@ -491,8 +580,7 @@ async def date_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Check if the date is in the past to show all reminders (including sent/cancelled)
-    import pytz
-    now = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires'))
+    now = datetime.now(db.BA_TZ)
     is_past_date = target_date.date() < now.date()
 
     # Get reminders for that date
@@ -503,22 +591,15 @@ async def date_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Format date for display
     formatted_date = target_date.strftime("%d/%m/%Y")
-    weekday = target_date.strftime("%A")
-
-    # Translate weekday to Spanish
-    weekday_spanish = {
-        'Monday': 'Lunes', 'Tuesday': 'Martes', 'Wednesday': 'Miércoles',
-        'Thursday': 'Jueves', 'Friday': 'Viernes', 'Saturday': 'Sábado', 'Sunday': 'Domingo'
-    }
-    weekday = weekday_spanish.get(weekday, weekday)
+    weekday = _DAY_NAMES[target_date.weekday()]
 
     if not reminders:
         past_indicator = "(incluyendo enviados/cancelados)" if is_past_date else ""
         await update.message.reply_text(f"📅 No tienes recordatorios para el {weekday} {formatted_date} {past_indicator}.")
         return
 
-    past_indicator = "📋 **Historial completo** - " if is_past_date else ""
-    message = f"📅 {past_indicator}**Recordatorios para {weekday} {formatted_date}:**\n\n"
+    past_indicator = "📋 <b>Historial completo</b> - " if is_past_date else ""
+    parts = [f"📅 {past_indicator}<b>Recordatorios para {weekday} {formatted_date}:</b>\n\n"]
 
     for reminder in reminders:
         # Show only time for same-day reminders
@@ -539,8 +620,10 @@ async def date_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Important indicator
         important_indicator = '🔥 ' if reminder.get('is_important') else ''
 
-        message += f"{status_emoji} {important_indicator}**#{reminder['id']}** - {formatted_time}\n"
-        message += f"   {reminder['text']}\n"
+        entry = (
+            f"{status_emoji} {important_indicator}<b>#{reminder['id']}</b> - {formatted_time}\n"
+            f"   {html.escape(reminder['text'])}\n"
+        )
 
         # Show status for past dates
         if is_past_date and 'status' in reminder and reminder['status'] != 'active':
@@ -550,11 +633,11 @@ async def date_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 'completed': '(Completado)'
             }.get(reminder['status'], '')
             if status_text:
-                message += f"   _{status_text}_\n"
+                entry += f"   <i>{status_text}</i>\n"
 
-        message += "\n"
+        parts.append(entry + "\n")
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await _send_chunked(update.message.reply_text, parts)
 
 async def history_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /historial command."""
@@ -592,13 +675,13 @@ async def history_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Build header message
     if status_filter == 'sent':
-        header = "📜 **Recordatorios enviados:**"
+        header = "📜 <b>Recordatorios enviados:</b>"
     elif status_filter == 'cancelled':
-        header = "📜 **Recordatorios cancelados:**"
+        header = "📜 <b>Recordatorios cancelados:</b>"
     else:
-        header = "📜 **Historial de recordatorios:**"
+        header = "📜 <b>Historial de recordatorios:</b>"
 
-    message = f"{header}\n\n"
+    parts = [f"{header}\n\n"]
 
     for reminder in reminders:
         formatted_date = reminder['datetime'].strftime("%d/%m/%Y %H:%M")
@@ -614,11 +697,13 @@ async def history_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             status_emoji = "❓"
             status_text = reminder['status']
 
-        message += f"{status_emoji} **#{reminder['id']}** - {formatted_date} ({status_text})\n"
-        message += f"   {reminder['text']}\n\n"
+        parts.append(
+            f"{status_emoji} <b>#{reminder['id']}</b> - {formatted_date} ({status_text})\n"
+            f"   {html.escape(reminder['text'])}\n\n"
+        )
 
-    message += f"_(Mostrando últimos {len(reminders)} recordatorios)_"
-    await update.message.reply_text(message, parse_mode='Markdown')
+    parts.append(f"<i>(Mostrando últimos {len(reminders)} recordatorios)</i>")
+    await _send_chunked(update.message.reply_text, parts)
 
 async def vault_history_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /historialBitacora command."""
@@ -629,17 +714,19 @@ async def vault_history_command(update: Update, context: ContextTypes.DEFAULT_TY
         await update.message.reply_text("📖 No hay entradas eliminadas en el historial de la bitácora")
         return
 
-    message = f"🗂️ **Historial de bitácora (eliminadas):**\n\n"
+    parts = [f"🗂️ <b>Historial de bitácora (eliminadas):</b>\n\n"]
 
     for entry in entries:
         created_date = entry['created_at'].strftime("%d/%m/%Y")
         deleted_date = entry['deleted_at'].strftime("%d/%m/%Y") if entry['deleted_at'] else "N/A"
 
-        message += f"🗑️ **#{entry['id']}** - Creada: {created_date} | Eliminada: {deleted_date} [#{entry['category']}]\n"
-        message += f"   {entry['text']}\n\n"
+        parts.append(
+            f"🗑️ <b>#{entry['id']}</b> - Creada: {created_date} | Eliminada: {deleted_date} [#{html.escape(entry['category'] or 'general')}]\n"
+            f"   {html.escape(entry['text'])}\n\n"
+        )
 
-    message += f"_(Mostrando últimas {len(entries)} entradas eliminadas)_"
-    await update.message.reply_text(message, parse_mode='Markdown')
+    parts.append(f"<i>(Mostrando últimas {len(entries)} entradas eliminadas)</i>")
+    await _send_chunked(update.message.reply_text, parts)
 
 async def vault_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /bitacora command."""
@@ -657,14 +744,8 @@ async def vault_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ El texto de la bitácora no puede estar vacío.")
         return
 
-    # Extract explicit category if present
-    text, explicit_category = extract_explicit_category(text)
-
-    # Capitalize first letter
-    text = capitalize_first_letter(text)
-
-    # Use explicit category or extract from text
-    category = explicit_category if explicit_category else extract_category_from_text(text)
+    # Strip explicit category, capitalize and categorize
+    text, category = prepare_entry_text(text)
     vault_id = db.add_vault_entry(chat_id, text, category)
     await update.message.reply_text(f"📖 Guardado en la bitácora (#{vault_id}): \"{text}\" [#{category}]")
 
@@ -677,15 +758,17 @@ async def vault_list_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text("📖 Tu bitácora está vacía.")
         return
 
-    message = "📖 **Tu bitácora:**\n\n"
+    parts = ["📖 <b>Tu bitácora:</b>\n\n"]
 
     for entry in entries:
         formatted_date = entry['created_at'].strftime("%d/%m/%Y")
-        message += f"📝 **#{entry['id']}** - {formatted_date}\n"
-        message += f"   {entry['text']}\n\n"
+        parts.append(
+            f"📝 <b>#{entry['id']}</b> - {formatted_date}\n"
+            f"   {html.escape(entry['text'])}\n\n"
+        )
 
-    message += f"_(Total: {len(entries)} entradas)_"
-    await update.message.reply_text(message, parse_mode='Markdown')
+    parts.append(f"<i>(Total: {len(entries)} entradas)</i>")
+    await _send_chunked(update.message.reply_text, parts)
 
 async def vault_search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /buscar bitacora command."""
@@ -703,8 +786,7 @@ async def vault_search_command(update: Update, context: ContextTypes.DEFAULT_TYP
     keyword = ' '.join(context.args)
 
     # Remove quotes if present
-    if (keyword.startswith('"') and keyword.endswith('"')) or (keyword.startswith("'") and keyword.endswith("'")):
-        keyword = keyword[1:-1]
+    keyword = _strip_quotes(keyword)
 
     if not keyword.strip():
         await update.message.reply_text("❌ La búsqueda no puede estar vacía.")
@@ -725,23 +807,25 @@ async def vault_search_command(update: Update, context: ContextTypes.DEFAULT_TYP
         return
 
     if is_category:
-        message = f"🔍 **Bitácora - Categoría \"{search_term}\":**\n\n"
+        parts = [f"🔍 <b>Bitácora - Categoría \"{html.escape(search_term)}\":</b>\n\n"]
     else:
-        message = f"🔍 **Bitácora - Entradas encontradas con \"{search_term}\":**\n\n"
+        parts = [f"🔍 <b>Bitácora - Entradas encontradas con \"{html.escape(search_term)}\":</b>\n\n"]
 
     for entry in entries:
         formatted_date = entry['created_at'].strftime("%d/%m/%Y")
 
         # Highlight the keyword in the text - only for text search
         if is_category:
-            highlighted_text = entry['text']
+            highlighted_text = html.escape(entry['text'])
         else:
             highlighted_text = _highlight_keyword(entry['text'], search_term)
 
-        message += f"📝 **#{entry['id']}** - {formatted_date}\n"
-        message += f"   {highlighted_text}\n\n"
+        parts.append(
+            f"📝 <b>#{entry['id']}</b> - {formatted_date}\n"
+            f"   {highlighted_text}\n\n"
+        )
 
-    await update.message.reply_text(message, parse_mode='Markdown')
+    await _send_chunked(update.message.reply_text, parts)
 
 async def vault_delete_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /borrarBitacora command."""
@@ -792,10 +876,9 @@ async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     chat_id = update.effective_chat.id
-    full_text = ' '.join(context.args)
 
     # Handle "todos" case
-    if full_text.lower() in ['todos', 'all']:
+    if len(context.args) == 1 and context.args[0].lower() in ['todos', 'all']:
         # Get all active reminder IDs before cancelling
         active_reminders = db.get_active_reminders(chat_id)
         reminder_ids = [r['id'] for r in active_reminders]
@@ -808,41 +891,51 @@ async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text("📝 No tienes recordatorios activos para cancelar")
         return
 
-    # Parse reminder IDs from various formats
-    reminder_ids = _parse_reminder_ids(full_text)
+    # Parse reminder IDs from various formats (dropping repeats, keeping order)
+    reminder_ids = list(dict.fromkeys(_parse_reminder_ids(context.args)))
 
     if not reminder_ids:
         await update.message.reply_text("❌ Formato inválido. Usa números separados por comas, espacios o rangos (ej: 1-5)")
         return
 
-    # Cancel multiple reminders
+    # Cancel all requested reminders in one DB round trip
+    db_result = db.cancel_multiple_reminders(chat_id, reminder_ids)
+    scheduler.cancel_multiple_reminder_jobs(db_result["cancelled"])
+
     if len(reminder_ids) == 1:
-        # Single reminder - use original logic for backward compatibility
+        # Single reminder - keep the short confirmation
         reminder_id = reminder_ids[0]
-        if db.cancel_reminder(chat_id, reminder_id):
-            scheduler.cancel_reminder_job(reminder_id)
+        if db_result["cancelled"]:
             await update.message.reply_text(f"❌ Recordatorio #{reminder_id} cancelado")
         else:
             await update.message.reply_text(f"❌ No se encontró el recordatorio #{reminder_id}")
-    else:
-        # Multiple reminders
-        db_result = db.cancel_multiple_reminders(chat_id, reminder_ids)
-        scheduler.cancel_multiple_reminder_jobs(db_result["cancelled"])
+        return
 
-        # Build response message
-        message_parts = []
-        if db_result["cancelled"]:
-            cancelled_str = ", ".join(f"#{id}" for id in db_result["cancelled"])
-            message_parts.append(f"❌ Cancelados: {cancelled_str}")
+    # Build response message
+    message_parts = []
+    if db_result["cancelled"]:
+        cancelled_str = ", ".join(f"#{id}" for id in db_result["cancelled"])
+        message_parts.append(f"❌ Cancelados: {cancelled_str}")
 
-        if db_result["not_found"]:
-            not_found_str = ", ".join(f"#{id}" for id in db_result["not_found"])
-            message_parts.append(f"❓ No encontrados: {not_found_str}")
+    if db_result["not_found"]:
+        not_found_str = ", ".join(f"#{id}" for id in db_result["not_found"])
+        message_parts.append(f"❓ No encontrados: {not_found_str}")
 
-        if not message_parts:
-            message_parts.append("❌ No se pudieron cancelar los recordatorios")
+    if not message_parts:
+        message_parts.append("❌ No se pudieron cancelar los recordatorios")
 
-        await update.message.reply_text("\n".join(message_parts))
+    await update.message.reply_text("\n".join(message_parts))
+
+# Words that make a free-text message a reminder attempt
+_REMINDER_KEYWORDS = ('recordar', 'recordame', 'aviso', 'avisame', 'haceme acordar', 'acordar')
+# Words that make a free-text message a vault entry (bitácora), plus accent-free variants
+_VAULT_KEYWORDS = ('anotá', 'anota', 'nota que', 'apuntar que', 'recordar que', 'acordarme que', 'guardar que')
+_VAULT_KEYWORDS_NORMALIZED = tuple(dict.fromkeys(db.normalize_text_for_search(kw) for kw in _VAULT_KEYWORDS))
+# All vault keywords in one pass (longest alternatives first)
+_VAULT_KEYWORDS_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted(_VAULT_KEYWORDS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
 
 async def free_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle natural language messages."""
@@ -867,32 +960,19 @@ async def free_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     text = update.message.text.lower()
 
-    # Check if it's a reminder attempt
-    keywords = ['recordar', 'recordame', 'aviso', 'avisame', 'haceme acordar', 'acordar']
-
     # Check if it's a vault entry (bitácora)
-    vault_keywords = ['anotá', 'anota', 'nota que', 'apuntar que', 'recordar que', 'acordarme que', 'guardar que']
-    # Also check normalized text for accent variations
-    normalized_text = normalize_text_for_search(text)
-    vault_keywords_normalized = [normalize_text_for_search(kw) for kw in vault_keywords]
+    # The normalized text covers accent variations and every match in the raw text as well
+    # (text is already lowercase, so plain ASCII needs no normalization at all)
+    normalized_text = text if text.isascii() else db.normalize_text_for_search(text)
 
-    if any(keyword in text for keyword in vault_keywords) or any(keyword in normalized_text for keyword in vault_keywords_normalized):
+    if any(keyword in normalized_text for keyword in _VAULT_KEYWORDS_NORMALIZED):
         # Remove vault keywords and save to vault
-        clean_text = update.message.text
-        for keyword in vault_keywords:
-            clean_text = re.sub(rf'\b{keyword}\b', '', clean_text, flags=re.IGNORECASE)
-        clean_text = clean_text.strip()
+        clean_text = _VAULT_KEYWORDS_RE.sub('', update.message.text).strip()
 
         if clean_text:
-            # Extract explicit category if present
-            clean_text, explicit_category = extract_explicit_category(clean_text)
-
-            # Capitalize first letter
-            clean_text = capitalize_first_letter(clean_text)
+            # Strip explicit category, capitalize and categorize
+            clean_text, category = prepare_entry_text(clean_text)
             chat_id = update.effective_chat.id
-
-            # Use explicit category or extract from text
-            category = explicit_category if explicit_category else extract_category_from_text(clean_text)
             vault_id = db.add_vault_entry(chat_id, clean_text, category)
             await update.message.reply_text(f"📖 Guardado en la bitácora (#{vault_id}): \"{clean_text}\" [#{category}]")
         else:
@@ -913,22 +993,24 @@ async def free_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 await update.message.reply_text(f"🤔 No encontré información sobre: {terms_str}")
                 return
 
-            message = f"🔍 **Esto es lo que sé sobre tu consulta:**\n\n"
+            parts = [f"🔍 <b>Esto es lo que sé sobre tu consulta:</b>\n\n"]
 
             for entry in entries[:5]:  # Limit to top 5 results
                 formatted_date = entry['created_at'].strftime("%d/%m/%Y")
                 score_emoji = "🎯" if entry['score'] >= 2 else "📝"
 
-                message += f"{score_emoji} **#{entry['id']}** - {formatted_date}\n"
-                message += f"   {entry['text']}\n\n"
+                parts.append(
+                    f"{score_emoji} <b>#{entry['id']}</b> - {formatted_date}\n"
+                    f"   {html.escape(entry['text'])}\n\n"
+                )
 
-            await update.message.reply_text(message, parse_mode='Markdown')
+            await _send_chunked(update.message.reply_text, parts)
         else:
             await update.message.reply_text("🤔 No pude entender tu pregunta. Intenta ser más específico.")
         return
 
     # Check if it's a bitácora search using "Averigua" (with or without accent)
-    elif text.startswith('averigua') or normalize_text_for_search(text).startswith('averigua'):
+    elif normalized_text.startswith('averigua'):
         chat_id = update.effective_chat.id
         # Handle both "averigua" and "averiguá"
         if text.startswith('averigua'):
@@ -947,7 +1029,7 @@ async def free_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 search_type = "categoría"
             elif len(search_terms) > 1:
                 # Use conversational search for multiple terms
-                normalized_terms = [normalize_text_for_search(term) for term in search_terms]
+                normalized_terms = [db.normalize_text_for_search(term) for term in search_terms]
                 entries = db.search_vault_conversational(chat_id, normalized_terms)
                 search_type = f"términos: {', '.join(search_terms)}"
             else:
@@ -963,22 +1045,22 @@ async def free_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 return
 
             if is_category:
-                message = f"🔍 **Bitácora - Categoría \"{search_term}\":**\n\n"
+                parts = [f"🔍 <b>Bitácora - Categoría \"{html.escape(search_term)}\":</b>\n\n"]
             elif len(search_terms) > 1:
-                message = f"🔍 **Bitácora - Búsqueda con {search_type}:**\n\n"
+                parts = [f"🔍 <b>Bitácora - Búsqueda con {html.escape(search_type)}:</b>\n\n"]
             else:
-                message = f"🔍 **Bitácora - Búsqueda \"{search_term}\":**\n\n"
+                parts = [f"🔍 <b>Bitácora - Búsqueda \"{html.escape(search_term)}\":</b>\n\n"]
 
             for entry in entries:
                 formatted_date = entry['created_at'].strftime("%d/%m/%Y")
 
                 # Highlight the keyword in the text - only for text search
                 if is_category:
-                    highlighted_text = entry['text']
+                    highlighted_text = html.escape(entry['text'])
                     entry_emoji = "📝"
                 elif len(search_terms) > 1:
                     # For multiple terms, show the text as-is (highlighting multiple terms is complex)
-                    highlighted_text = entry['text']
+                    highlighted_text = html.escape(entry['text'])
                     # Use score emoji instead of default 📝 if available
                     if 'score' in entry:
                         entry_emoji = "🎯" if entry['score'] >= 2 else "📝"
@@ -988,10 +1070,12 @@ async def free_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     highlighted_text = _highlight_keyword(entry['text'], search_term)
                     entry_emoji = "📝"
 
-                message += f"{entry_emoji} **#{entry['id']}** - {formatted_date}\n"
-                message += f"   {highlighted_text}\n\n"
+                parts.append(
+                    f"{entry_emoji} <b>#{entry['id']}</b> - {formatted_date}\n"
+                    f"   {highlighted_text}\n\n"
+                )
 
-            await update.message.reply_text(message, parse_mode='Markdown')
+            await _send_chunked(update.message.reply_text, parts)
         else:
             await update.message.reply_text(
                 "❌ Especifica qué averiguar.\n"
@@ -1009,7 +1093,7 @@ async def free_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Check if it's a reminder
-    elif any(keyword in text for keyword in keywords):
+    elif any(keyword in text for keyword in _REMINDER_KEYWORDS):
         await process_reminder(update, context, update.message.text)
     else:
         await update.message.reply_text(
@@ -1036,20 +1120,13 @@ async def process_reminder(update: Update, context: ContextTypes.DEFAULT_TYPE, t
         await update.message.reply_text("❌ Falta el texto del recordatorio.")
         return
 
-    # Extract explicit category if present
-    reminder_text, explicit_category = extract_explicit_category(reminder_text)
-
-    # Capitalize first letter
-    reminder_text = capitalize_first_letter(reminder_text)
-
-    # Verify that the date is in the future
-    now = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires'))
-    if datetime_obj <= now:
+    # Verify that the date is in the future before doing any more work on the text
+    if datetime_obj <= datetime.now(db.BA_TZ):
         await update.message.reply_text("❌ La fecha debe ser en el futuro.")
         return
 
-    # Use explicit category or extract from text
-    category = explicit_category if explicit_category else extract_category_from_text(reminder_text)
+    # Strip explicit category, capitalize and categorize
+    reminder_text, category = prepare_entry_text(reminder_text)
     reminder_id = db.add_reminder(chat_id, reminder_text, datetime_obj, category)
     scheduler.schedule_reminder(
         context.bot, chat_id, reminder_id, reminder_text, datetime_obj
@@ -1061,31 +1138,36 @@ async def process_reminder(update: Update, context: ContextTypes.DEFAULT_TYPE, t
         f"✅ Dale, te aviso el {formatted_date}: \"{reminder_text}\" [#{category}] (ID #{reminder_id})"
     )
 
+# Map Spanish weekdays to numbers (Monday=0)
+_WEEKDAYS = {
+    'lunes': 0, 'martes': 1, 'miercoles': 2, 'jueves': 3,
+    'viernes': 4, 'sabado': 5, 'domingo': 6
+}
+
+def _at_9am(year: int, month: int, day: int, now: datetime) -> datetime:
+    """Build a 9:00 datetime on the given date in now's timezone (raises ValueError for invalid dates)."""
+    return datetime(year, month, day, 9, tzinfo=now.tzinfo)
+
+def _next_month(year: int, month: int) -> Tuple[int, int]:
+    """Return the (year, month) that follows the given one."""
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
 def _smart_day_parse(day: int, now: datetime) -> datetime:
     """Parse a day of the month intelligently (e.g., 'el 20')."""
     if day < 1 or day > 31:
         return None
 
     # Try current month first
-    try:
-        target_date = now.replace(day=day, hour=9, minute=0, second=0, microsecond=0)
-        # If the date is in the past, try next month
-        if target_date <= now:
-            if now.month == 12:
-                target_date = target_date.replace(year=now.year + 1, month=1)
-            else:
-                target_date = target_date.replace(month=now.month + 1)
-        return target_date
-    except ValueError:
-        # Day doesn't exist in current month, try next month
-        try:
-            if now.month == 12:
-                target_date = now.replace(year=now.year + 1, month=1, day=day, hour=9, minute=0, second=0, microsecond=0)
-            else:
-                target_date = now.replace(month=now.month + 1, day=day, hour=9, minute=0, second=0, microsecond=0)
+    if day <= calendar.monthrange(now.year, now.month)[1]:
+        target_date = _at_9am(now.year, now.month, day, now)
+        if target_date > now:
             return target_date
-        except ValueError:
-            return None
+
+    # The date is in the past or doesn't exist in current month, try next month
+    year, month = _next_month(now.year, now.month)
+    if day > calendar.monthrange(year, month)[1]:
+        return None
+    return _at_9am(year, month, day, now)
 
 def _smart_date_parse(day: int, month: int, now: datetime) -> datetime:
     """Parse day/month intelligently (e.g., '20/12')."""
@@ -1093,79 +1175,60 @@ def _smart_date_parse(day: int, month: int, now: datetime) -> datetime:
         return None
 
     # Try current year first
-    try:
-        target_date = now.replace(year=now.year, month=month, day=day, hour=9, minute=0, second=0, microsecond=0)
-        # If the date is in the past, use next year
-        if target_date <= now:
-            target_date = target_date.replace(year=now.year + 1)
-        return target_date
-    except ValueError:
+    if day > calendar.monthrange(now.year, month)[1]:
         return None
+    target_date = _at_9am(now.year, month, day, now)
+    # If the date is in the past, use next year (29/02 may not exist there)
+    if target_date <= now:
+        if day > calendar.monthrange(now.year + 1, month)[1]:
+            return None
+        target_date = _at_9am(now.year + 1, month, day, now)
+    return target_date
 
 def _smart_date_parse_with_past(day: int, month: int, now: datetime) -> datetime:
     """Parse day/month intelligently, allowing past dates (e.g., '22/09')."""
     if day < 1 or day > 31 or month < 1 or month > 12:
         return None
 
-    # Always try current year first, regardless of whether it's past or future
-    try:
-        target_date = now.replace(year=now.year, month=month, day=day, hour=0, minute=0, second=0, microsecond=0)
-        return target_date
-    except ValueError:
-        # If invalid for current year (e.g., Feb 30), try previous year
-        try:
-            target_date = now.replace(year=now.year - 1, month=month, day=day, hour=0, minute=0, second=0, microsecond=0)
-            return target_date
-        except ValueError:
-            return None
+    # Always try current year first, regardless of whether it's past or future;
+    # if invalid for current year (e.g., 29/02), try previous year
+    for year in (now.year, now.year - 1):
+        if day <= calendar.monthrange(year, month)[1]:
+            return now.replace(year=year, month=month, day=day, hour=0, minute=0, second=0, microsecond=0)
+    return None
 
 def _smart_day_parse_with_past(day: int, now: datetime) -> datetime:
     """Parse day of current month intelligently, allowing past dates."""
-    if day < 1 or day > 31:
+    if day < 1 or day > calendar.monthrange(now.year, now.month)[1]:
         return None
 
-    try:
-        # Try current month first
-        target_date = now.replace(day=day, hour=0, minute=0, second=0, microsecond=0)
-        return target_date
-    except ValueError:
-        return None
+    return now.replace(day=day, hour=0, minute=0, second=0, microsecond=0)
 
 def _smart_weekday_day_parse_with_past(weekday_str: str, day: int, now: datetime) -> datetime:
     """Parse weekday + day combination, allowing past dates."""
-    weekdays = {
-        'lunes': 0, 'martes': 1, 'miercoles': 2, 'jueves': 3,
-        'viernes': 4, 'sabado': 5, 'domingo': 6
-    }
-
-    target_weekday = weekdays.get(weekday_str.lower())
+    target_weekday = _WEEKDAYS.get(weekday_str.lower())
     if target_weekday is None or day < 1 or day > 31:
         return None
 
-    # Find the date that matches both weekday and day in current or previous months
-    for month_offset in range(0, -12, -1):  # Check current and previous 12 months
-        try:
-            test_month = now.month + month_offset
-            test_year = now.year
-
-            # Handle year rollover
-            while test_month <= 0:
-                test_month += 12
-                test_year -= 1
-            while test_month > 12:
-                test_month -= 12
-                test_year += 1
-
-            target_date = now.replace(year=test_year, month=test_month, day=day, hour=0, minute=0, second=0, microsecond=0)
-
-            if target_date.weekday() == target_weekday:
-                return target_date
-
-        except ValueError:
-            continue
+    # Find the date that matches both weekday and day in current or previous months,
+    # walking back with plain weekday arithmetic so only the match becomes a datetime
+    year, month = now.year, now.month
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+    for _ in range(12):  # Check current and previous 11 months
+        if day <= days_in_month and (first_weekday + day - 1) % 7 == target_weekday:
+            return now.replace(year=year, month=month, day=day, hour=0, minute=0, second=0, microsecond=0)
+
+        month -= 1
+        if month == 0:
+            month = 12
+            year -= 1
+        days_in_month = calendar.monthrange(year, month)[1]
+        first_weekday = (first_weekday - days_in_month) % 7
 
     return None
 
+_HALF_DAY = timedelta(hours=12)
+
 def _smart_hour_parse(hour: int, minute: int, now: datetime) -> datetime:
     """Parse hour intelligently (e.g., 'a las 9')."""
     if hour < 0 or hour > 23 or minute < 0 or minute > 59:
@@ -1178,223 +1241,325 @@ def _smart_hour_parse(hour: int, minute: int, now: datetime) -> datetime:
             target_time += timedelta(days=1)
         return target_time
 
-    # For hours 1-12, we need to infer AM/PM
-    # Create both AM and PM options
+    # For hours 0-12, we need to infer AM/PM: use the first of today's AM time,
+    # today's PM time or tomorrow's AM time that is still in the future, i.e.
+    # step today's AM time forward in 12h increments until it passes now
     am_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-    pm_time = now.replace(hour=hour + 12, minute=minute, second=0, microsecond=0)
-
-    # Smart inference logic:
-    # 1. If it's before 6 AM, prefer AM times
-    if now.hour < 6:
-        if am_time > now:
-            return am_time
-        elif pm_time > now:
-            return pm_time
-        else:
-            return am_time + timedelta(days=1)
-
-    # 2. If it's morning (6 AM - 11:59 AM), prefer the next available time
-    elif 6 <= now.hour < 12:
-        if am_time > now:
-            return am_time
-        elif pm_time > now:
-            return pm_time
-        else:
-            return am_time + timedelta(days=1)
-
-    # 3. If it's afternoon/evening (12 PM onwards), prefer PM for reasonable hours
-    else:
-        # For typical evening hours (6-11), strongly prefer PM if it's future
-        if 6 <= hour <= 11 and pm_time > now:
-            return pm_time
-        # For early hours (1-5), could be either but prefer the next available
-        elif 1 <= hour <= 5:
-            if pm_time > now:
-                return pm_time
-            else:
-                return am_time + timedelta(days=1)
-        # For hours like 12, prefer PM if available
-        elif hour == 12:
-            if pm_time > now:
-                return pm_time
-            else:
-                return am_time + timedelta(days=1)
-        # For other cases, use next available
-        else:
-            if am_time > now:
-                return am_time
-            elif pm_time > now:
-                return pm_time
-            else:
-                return am_time + timedelta(days=1)
+    if am_time > now:
+        return am_time
+    return am_time + _HALF_DAY * ((now - am_time) // _HALF_DAY + 1)
 
 def _smart_weekday_day_parse(weekday: str, day: int, now: datetime) -> datetime:
     """Parse weekday + day (e.g., 'lunes 29')."""
     if day < 1 or day > 31:
         return None
 
-    # Map Spanish weekdays to numbers (Monday=0)
-    weekdays = {
-        'lunes': 0, 'martes': 1, 'miercoles': 2, 'jueves': 3,
-        'viernes': 4, 'sabado': 5, 'domingo': 6
-    }
-
-    target_weekday = weekdays.get(weekday.lower())
+    target_weekday = _WEEKDAYS.get(weekday.lower())
     if target_weekday is None:
         return None
 
     # Try current month first
-    try:
-        target_date = now.replace(day=day, hour=9, minute=0, second=0, microsecond=0)
+    if day <= calendar.monthrange(now.year, now.month)[1]:
+        target_date = _at_9am(now.year, now.month, day, now)
         # Check if it's the right weekday
         if target_date.weekday() == target_weekday:
-            # If it's in the past, try next month
-            if target_date <= now:
-                if now.month == 12:
-                    target_date = target_date.replace(year=now.year + 1, month=1)
-                else:
-                    target_date = target_date.replace(month=now.month + 1)
-            return target_date
-    except ValueError:
-        pass
+            if target_date > now:
+                return target_date
+            # If it's in the past, use the same day next month
+            year, month = _next_month(now.year, now.month)
+            if day > calendar.monthrange(year, month)[1]:
+                return None
+            return _at_9am(year, month, day, now)
 
     # Try next month
-    try:
-        if now.month == 12:
-            target_date = now.replace(year=now.year + 1, month=1, day=day, hour=9, minute=0, second=0, microsecond=0)
-        else:
-            target_date = now.replace(month=now.month + 1, day=day, hour=9, minute=0, second=0, microsecond=0)
-
+    year, month = _next_month(now.year, now.month)
+    if day <= calendar.monthrange(year, month)[1]:
+        target_date = _at_9am(year, month, day, now)
         if target_date.weekday() == target_weekday:
             return target_date
-    except ValueError:
-        pass
 
     return None
 
 def _smart_next_weekday_parse(weekday: str, now: datetime) -> datetime:
     """Parse 'weekday que viene' (e.g., 'lunes que viene')."""
-    # Map Spanish weekdays to numbers (Monday=0)
-    weekdays = {
-        'lunes': 0, 'martes': 1, 'miercoles': 2, 'jueves': 3,
-        'viernes': 4, 'sabado': 5, 'domingo': 6
-    }
-
-    target_weekday = weekdays.get(weekday.lower())
+    target_weekday = _WEEKDAYS.get(weekday.lower())
     if target_weekday is None:
         return None
 
-    # Calculate days until next occurrence of this weekday
-    current_weekday = now.weekday()
-    days_ahead = target_weekday - current_weekday
-
-    # If it's the same weekday, go to next week
-    if days_ahead <= 0:
-        days_ahead += 7
+    # Days until next occurrence of this weekday, 1..7 (same weekday goes to next week)
+    days_ahead = (target_weekday - now.weekday() - 1) % 7 + 1
 
-    target_date = now + timedelta(days=days_ahead)
-    target_date = target_date.replace(hour=9, minute=0, second=0, microsecond=0)
+    target_day = now.date() + timedelta(days=days_ahead)
+    return _at_9am(target_day.year, target_day.month, target_day.day, now)
 
-    return target_date
+# Reminder ID formats accepted by /cancelar
+_ID_RANGE_RE = re.compile(r'^(\d+)-(\d+)$')
+_COMMA_ID_RE = re.compile(r'(?:^|,)\s*(\d+)\s*(?=,|$)')
+_SPACE_ID_RE = re.compile(r'(?<!\S)\d+(?!\S)')
 
-def _parse_reminder_ids(text: str) -> list:
-    """Parse reminder IDs from various formats."""
-    reminder_ids = []
+def _parse_reminder_ids(args: List[str]) -> list:
+    """Parse reminder IDs from various formats, given the command's arguments."""
+    # Plain IDs, the common case: "5" or "1 2 3" (already split by Telegram)
+    if all(arg.isdecimal() for arg in args):
+        return list(map(int, args))
 
-    # Remove extra whitespace
-    text = text.strip()
+    text = ' '.join(args)
 
     # Handle comma-separated: "1,2,3"
     if ',' in text:
-        parts = text.split(',')
-        for part in parts:
-            part = part.strip()
-            if part.isdigit():
-                reminder_ids.append(int(part))
-        return reminder_ids
+        return list(map(int, _COMMA_ID_RE.findall(text)))
 
     # Handle ranges: "1-5"
-    if '-' in text and len(text.split()) == 1:
-        try:
-            start, end = text.split('-')
-            start, end = int(start.strip()), int(end.strip())
-            if start <= end:
-                reminder_ids.extend(range(start, end + 1))
-                return reminder_ids
-        except ValueError:
-            pass
+    match = _ID_RANGE_RE.match(text)
+    if match:
+        start, end = int(match.group(1)), int(match.group(2))
+        if start <= end:
+            return list(range(start, end + 1))
 
     # Handle space-separated: "1 2 3"
-    parts = text.split()
-    for part in parts:
-        if part.isdigit():
-            reminder_ids.append(int(part))
+    return list(map(int, _SPACE_ID_RE.findall(text)))
+
+@lru_cache(maxsize=256)
+def _compile_keyword(keyword: str):
+    """Compile a case-insensitive literal pattern for a search keyword (cached across searches)."""
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
+def _keyword_spans(text: str, keyword: str):
+    """Yield (start, end) of each case-insensitive, non-overlapping occurrence of keyword in text."""
+    # ASCII text and keyword: lowercasing is exact case folding, so plain str.find does the job
+    if keyword and text.isascii() and keyword.isascii():
+        text_lower = text.lower()
+        keyword_lower = keyword.lower()
+        start = text_lower.find(keyword_lower)
+        while start != -1:
+            end = start + len(keyword_lower)
+            yield start, end
+            start = text_lower.find(keyword_lower, end)
+        return
 
-    return reminder_ids
+    for match in _compile_keyword(keyword).finditer(text):
+        yield match.span()
 
 def _highlight_keyword(text: str, keyword: str) -> str:
-    """Highlight keyword in text using markdown bold formatting."""
-    # Case-insensitive replacement
-    import re
-    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-
-    def replace_func(match):
-        return f"**{match.group()}**"
-
-    # Only highlight if the keyword isn't already part of markdown formatting
-    # Simple approach: avoid double-formatting
-    if "**" in text:
-        # If text already has markdown, don't highlight to avoid conflicts
-        return text
+    """Highlight keyword in text using HTML bold tags (the rest of the text is HTML-escaped)."""
+    # Escape the text around each match so user content can't break the HTML markup
+    parts = []
+    last_end = 0
+    for start, end in _keyword_spans(text, keyword):
+        parts.append(html.escape(text[last_end:start]))
+        parts.append(f"<b>{html.escape(text[start:end])}</b>")
+        last_end = end
+    parts.append(html.escape(text[last_end:]))
+
+    return ''.join(parts)
+
+# Precompiled patterns for date parsing (built once at import time)
+_WEEKDAY_DAY_RE = re.compile(r'\b(?:el\s+)?(lunes|martes|miercoles|jueves|viernes|sabado|domingo)\s+(\d{1,2})\b', re.IGNORECASE)
+_NEXT_WEEKDAY_RE = re.compile(r'\b(?:el\s+)?(lunes|martes|miercoles|jueves|viernes|sabado|domingo)\s+que\s+viene\b', re.IGNORECASE)
+_HOUR_RE = re.compile(r'\ba\s*las?\s+(\d{1,2})(?::(\d{2}))?\b', re.IGNORECASE)
+_DATE_ONLY_PAST_RE = re.compile(r'^(\d{1,2})[\/-](\d{1,2})$')
+_COMMAND_RE = re.compile(r'^\/(?:recordar)\s*', re.IGNORECASE)
+_LEADING_QUE_RE = re.compile(r'^\s*que\s+', re.IGNORECASE)
+_ANTES_HOUR_RE = re.compile(r'(\d{1,2})(?::\d{2})?')
+_BASE_DATE_RE = re.compile(r'\b(?:mañana|tomorrow|hoy|today)\b', re.IGNORECASE)
+
+# Every smart/relative/date pattern below needs at least one of these tokens
+_DATE_HINT_RE = re.compile(
+    r'\d|en\s|mañana|tomorrow|hoy|today|lunes|martes|miercoles|jueves|viernes|sabado|domingo',
+    re.IGNORECASE
+)
+
+# Request words stripped from reminder text before parsing (longest alternatives first)
+_REQUEST_WORDS_RE = re.compile(
+    r'\b(?:haceme\s+acordar|recordame|recordar|avisame|acordar|aviso|de\s+que|que|de)\b',
+    re.IGNORECASE
+)
+
+# Smart patterns for /dia (allowing past dates): (pattern, calc_func(match, now))
+_SMART_PATTERNS_WITH_PAST = [
+    # "el lunes 29" or "lunes 29" (weekday + day)
+    (_WEEKDAY_DAY_RE, lambda m, now: _smart_weekday_day_parse_with_past(m.group(1), int(m.group(2)), now)),
+    # "el 20" (day of current month/year) - but not if it has / or -
+    (re.compile(r'^\b(?:el\s+)?(\d{1,2})\b$', re.IGNORECASE), lambda m, now: _smart_day_parse_with_past(int(m.group(1)), now))
+]
+
+# Smart pattern entries shared by date-only and reminder parsing: (pattern, calc_func(match, now))
+# "el lunes 29" or "lunes 29" (weekday + day)
+_WEEKDAY_DAY_PATTERN = (_WEEKDAY_DAY_RE, lambda m, now: _smart_weekday_day_parse(m.group(1), int(m.group(2)), now))
+# "el lunes que viene" or "lunes que viene"
+_NEXT_WEEKDAY_PATTERN = (_NEXT_WEEKDAY_RE, lambda m, now: _smart_next_weekday_parse(m.group(1), now))
+# "el 20/12" or "20/12" (day/month of current year)
+_DAY_MONTH_PATTERN = (re.compile(r'\b(?:el\s+)?(\d{1,2})[\/\-](\d{1,2})\b(?![\-:])', re.IGNORECASE), lambda m, now: _smart_date_parse(int(m.group(1)), int(m.group(2)), now))
+
+# Smart patterns for date-only parsing
+_SMART_DATE_PATTERNS = [
+    _WEEKDAY_DAY_PATTERN,  # HIGHER PRIORITY
+    _NEXT_WEEKDAY_PATTERN,  # HIGHER PRIORITY
+    # "el 20" or "20" (day of current month/year)
+    (re.compile(r'\b(?:el\s+)?(\d{1,2})\b(?![\/\-:])', re.IGNORECASE), lambda m, now: _smart_day_parse(int(m.group(1)), now)),
+    _DAY_MONTH_PATTERN
+]
+# Purely numeric input ("20", "20/12") can't match the weekday entries, so skip them
+_SMART_DATE_NUMERIC_PATTERNS = _SMART_DATE_PATTERNS[2:]
+
+# Smart patterns for reminder parsing
+_SMART_PATTERNS = [
+    _WEEKDAY_DAY_PATTERN,  # HIGHER PRIORITY
+    _NEXT_WEEKDAY_PATTERN,  # HIGHER PRIORITY
+    # "el 20" (day of current month/year) - requires "el" so bare numbers stay in the text
+    (re.compile(r'\bel\s+(\d{1,2})\b(?![\/\-:])', re.IGNORECASE), lambda m, now: _smart_day_parse(int(m.group(1)), now)),
+    _DAY_MONTH_PATTERN,
+    # "a las 9" (smart hour inference)
+    (_HOUR_RE, lambda m, now: _smart_hour_parse(int(m.group(1)), int(m.group(2)) if m.group(2) else 0, now))
+]
+# All reminder smart patterns as one alternation: a single scan tells whether any of them can match
+_SMART_ANY_RE = re.compile('|'.join(f'(?:{pattern.pattern})' for pattern, _ in _SMART_PATTERNS), re.IGNORECASE)
+
+# Spanish number words accepted in relative times
+_SPANISH_NUMBER_WORDS = {
+    'una': 1, 'un': 1, 'uno': 1,
+    'dos': 2, 'tres': 3, 'cuatro': 4, 'cinco': 5,
+    'seis': 6, 'siete': 7, 'ocho': 8, 'nueve': 9,
+    'diez': 10, 'media': 0.5
+}
 
-    return pattern.sub(replace_func, text)
+# Relative time patterns: (pattern, calc_func(match, now))
+_RELATIVE_PATTERNS = [
+    # Spanish number words for relative time
+    (re.compile(r'en\s+(una?|dos|tres|cuatro|cinco|seis|siete|ocho|nueve|diez|media)\s*h(?:oras?)?', re.IGNORECASE),
+     lambda m, now: now + timedelta(hours=_SPANISH_NUMBER_WORDS.get(m.group(1).lower()))),
+    (re.compile(r'en\s+(una?|dos|tres|cuatro|cinco|seis|siete|ocho|nueve|diez|media)\s*m(?:in)?(?:utos?)?', re.IGNORECASE),
+     lambda m, now: now + timedelta(minutes=_SPANISH_NUMBER_WORDS.get(m.group(1).lower()))),
+    # Numeric patterns
+    (re.compile(r'en\s+(\d+)\s*m(?:in)?(?:utos?)?', re.IGNORECASE), lambda m, now: now + timedelta(minutes=int(m.group(1)))),
+    (re.compile(r'en\s+(\d+)\s*h(?:oras?)?', re.IGNORECASE), lambda m, now: now + timedelta(hours=int(m.group(1)))),
+    (re.compile(r'en\s+(\d+)\s*d(?:ias?)?', re.IGNORECASE), lambda m, now: now + timedelta(days=int(m.group(1))))
+]
+
+# Simple date patterns without specific time
+_DATE_PATTERNS_NO_TIME = [
+    re.compile(r'\b(?:mañana|tomorrow)\b', re.IGNORECASE),
+    re.compile(r'\b(?:el\s+)?(?:lunes|martes|miercoles|jueves|viernes|sabado|domingo)\b', re.IGNORECASE),
+    re.compile(r'\b(?:hoy|today)\b', re.IGNORECASE)
+]
+
+# Specific date/time patterns (excluding those handled by smart patterns)
+_DATE_PATTERNS = [
+    re.compile(r'\b(?:mañana|tomorrow)\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?|\d{1,2}\s*de\s*la\s*(?:mañana|tarde|noche)|antes\s*de\s*las?\s*\d{1,2})', re.IGNORECASE),
+    re.compile(r'\b(?:el\s+)?(?:lunes|martes|miercoles|jueves|viernes|sabado|domingo)\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?)', re.IGNORECASE),
+    re.compile(r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?)?', re.IGNORECASE),  # Full dates with year
+    re.compile(r'\b\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:\d{2}\b', re.IGNORECASE),
+    re.compile(r'\b(?:hoy|today)\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?)', re.IGNORECASE),
+    re.compile(r'\bantes\s*de\s*las?\s*\d{1,2}(?::\d{2})?\b', re.IGNORECASE),
+    re.compile(r'\b\d{1,2}:\d{2}\b', re.IGNORECASE)
+]
+
+# Accent-free Spanish and English date words (including dateparser's abbreviations);
+# text with no digits and none of these words never parses as a date
+_DATE_WORDS = frozenset({
+    'ayer', 'anteayer', 'hoy', 'manana', 'ahora', 'mediodia', 'medianoche',
+    'pasado', 'pasada', 'proximo', 'proxima', 'ultimo', 'ultima', 'viene', 'hace', 'dentro',
+    'lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo',
+    'lun', 'mie', 'jue', 'vie', 'sab', 'dom', 'lu', 'ma', 'mi', 'ju', 'vi', 'sa', 'do',
+    'enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+    'septiembre', 'setiembre', 'octubre', 'noviembre', 'diciembre',
+    'ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul', 'ago', 'sep', 'set', 'sept', 'oct', 'nov', 'dic',
+    'ano', 'anos', 'mes', 'meses', 'semana', 'semanas', 'dia', 'dias',
+    'hora', 'horas', 'minuto', 'minutos', 'segundo', 'segundos', 'hr', 'hrs', 'min', 'mins', 'seg',
+    'today', 'tomorrow', 'yesterday', 'now', 'ago', 'next', 'last', 'this', 'noon', 'midnight',
+    'day', 'days', 'week', 'weeks', 'wk', 'month', 'months', 'mo', 'year', 'years', 'yr', 'decade',
+    'hour', 'hours', 'minute', 'minutes', 'second', 'seconds',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+    'mon', 'tue', 'tues', 'wed', 'thu', 'thur', 'thurs', 'fri', 'sat', 'sun',
+    'january', 'february', 'march', 'april', 'june', 'july', 'august',
+    'september', 'october', 'november', 'december',
+    'jan', 'apr', 'aug', 'dec'
+})
+_DIGIT_RE = re.compile(r'\d')
+_LETTERS_RE = re.compile(r'[a-z]+')
+
+def _has_date_words(text: str) -> bool:
+    """Cheap check for whether dateparser could possibly find a date in text."""
+    if _DIGIT_RE.search(text):
+        return True
+    return any(word in _DATE_WORDS for word in _LETTERS_RE.findall(db.normalize_text_for_search(text)))
+
+# Common date shapes resolved without dateparser: "mañana 18:00", "hoy", "25/12/2025 09:30"
+_FAST_NAMED_DAY_RE = re.compile(r'^(mañana|tomorrow|hoy|today)(?:\s+(\d{1,2}):(\d{2}))?$', re.IGNORECASE)
+_FAST_FULL_DATE_RE = re.compile(r'^(\d{1,2})[\/-](\d{1,2})[\/-](\d{4})(?:\s+(\d{1,2}):(\d{2}))?$')
+
+def _fast_parse(text: str, now: datetime):
+    """Parse the most common date shapes directly.
+
+    Returns a naive datetime, exactly as dateparser would for the same text,
+    or None when the text isn't one of these shapes (callers fall back to dateparser).
+    """
+    match = _FAST_NAMED_DAY_RE.match(text)
+    if match:
+        day = now.replace(tzinfo=None)
+        if match.group(1).lower() in ('mañana', 'tomorrow'):
+            day += timedelta(days=1)
+        if match.group(2) is None:
+            return day
+
+        hour, minute = int(match.group(2)), int(match.group(3))
+        if hour > 23 or minute > 59:
+            return None
+        return day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    match = _FAST_FULL_DATE_RE.match(text)
+    if match:
+        day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        hour = int(match.group(4)) if match.group(4) else 0
+        minute = int(match.group(5)) if match.group(5) else 0
+        try:
+            return datetime(year, month, day, hour, minute)
+        except ValueError:
+            return None
+
+    return None
+
+def _try_smart_patterns(patterns: list, text: str, now: datetime):
+    """Return (datetime, match) for the first smart pattern that yields a date, or (None, None)."""
+    for pattern, calc_func in patterns:
+        match = pattern.search(text)
+        if match:
+            datetime_obj = calc_func(match, now)
+            if datetime_obj:
+                return datetime_obj, match
+    return None, None
 
 def _parse_date_only_with_past(text: str) -> datetime:
     """Parse a date string without extracting reminder text, allowing past dates."""
-    import pytz
-
     # Clean text
     text = text.strip()
 
     # Get current time for smart inference
-    now = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires'))
+    now = datetime.now(db.BA_TZ)
 
     # Handle "ayer" (yesterday)
     if 'ayer' in text.lower():
         return now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
 
     # Direct DD/MM or DD-MM pattern check first (most common case)
-    date_pattern = r'^(\d{1,2})[\/-](\d{1,2})$'
-    match = re.match(date_pattern, text)
+    match = _DATE_ONLY_PAST_RE.match(text)
     if match:
         day = int(match.group(1))
         month = int(match.group(2))
         return _smart_date_parse_with_past(day, month, now)
 
     # Other patterns with simpler regex
-    smart_patterns = [
-        # "el lunes 29" or "lunes 29" (weekday + day)
-        (r'\b(?:el\s+)?(lunes|martes|miercoles|jueves|viernes|sabado|domingo)\s+(\d{1,2})\b', lambda m: _smart_weekday_day_parse_with_past(m.group(1), int(m.group(2)), now)),
-        # "el 20" (day of current month/year) - but not if it has / or -
-        (r'^\b(?:el\s+)?(\d{1,2})\b$', lambda m: _smart_day_parse_with_past(int(m.group(1)), now))
-    ]
-
-    for pattern, calc_func in smart_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            datetime_obj = calc_func(match)
-            if datetime_obj:
-                return datetime_obj
+    datetime_obj, _ = _try_smart_patterns(_SMART_PATTERNS_WITH_PAST, text, now)
+    if datetime_obj:
+        return datetime_obj
+
+    # dateparser is slow to give up on text with no date words at all, so don't ask it
+    if not _has_date_words(text):
+        return None
 
     # Try with dateparser for natural language dates (allowing past)
     # But use our custom settings that respect DD/MM format
-    parsed_date = dateparser.parse(text, settings={
-        'DATE_ORDER': 'DMY',
-        'PREFER_DAY_OF_MONTH': 'first',
-        'STRICT_PARSING': False,
-        'RETURN_AS_TIMEZONE_AWARE': True,
-        'TIMEZONE': 'America/Argentina/Buenos_Aires'
-    })
+    parsed_date = _fast_parse(text, now) or _get_date(_DATEPARSER_PAST, text)
 
     if parsed_date:
         # If parsed but has no specific time, set to start of day
@@ -1402,7 +1567,7 @@ def _parse_date_only_with_past(text: str) -> datetime:
 
         # Ensure the date has timezone
         if parsed_date.tzinfo is None:
-            parsed_date = pytz.timezone('America/Argentina/Buenos_Aires').localize(parsed_date)
+            parsed_date = parsed_date.replace(tzinfo=db.BA_TZ)
 
         return parsed_date
 
@@ -1410,35 +1575,23 @@ def _parse_date_only_with_past(text: str) -> datetime:
 
 def _parse_date_only(text: str) -> datetime:
     """Parse a date string without extracting reminder text."""
-    import pytz
-
     # Clean text
     text = text.strip()
 
     # Get current time for smart inference
-    now = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires'))
+    now = datetime.now(db.BA_TZ)
 
     # Smart patterns for intuitive date parsing (reusing existing logic)
-    smart_patterns = [
-        # "el lunes 29" or "lunes 29" (weekday + day) - HIGHER PRIORITY
-        (r'\b(?:el\s+)?(lunes|martes|miercoles|jueves|viernes|sabado|domingo)\s+(\d{1,2})\b', lambda m: _smart_weekday_day_parse(m.group(1), int(m.group(2)), now)),
-        # "el lunes que viene" or "lunes que viene" - HIGHER PRIORITY
-        (r'\b(?:el\s+)?(lunes|martes|miercoles|jueves|viernes|sabado|domingo)\s+que\s+viene\b', lambda m: _smart_next_weekday_parse(m.group(1), now)),
-        # "el 20" (day of current month/year)
-        (r'\b(?:el\s+)?(\d{1,2})\b(?![\/\-:])', lambda m: _smart_day_parse(int(m.group(1)), now)),
-        # "el 20/12" or "20/12" (day/month of current year)
-        (r'\b(?:el\s+)?(\d{1,2})[\/-](\d{1,2})\b(?![\-:])', lambda m: _smart_date_parse(int(m.group(1)), int(m.group(2)), now))
-    ]
-
-    for pattern, calc_func in smart_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            datetime_obj = calc_func(match)
-            if datetime_obj:
-                return datetime_obj
+    if text[:1].isdigit() and not any(c.isalpha() for c in text):
+        patterns = _SMART_DATE_NUMERIC_PATTERNS
+    else:
+        patterns = _SMART_DATE_PATTERNS
+    datetime_obj, _ = _try_smart_patterns(patterns, text, now)
+    if datetime_obj:
+        return datetime_obj
 
     # Try with dateparser for natural language dates
-    parsed_date = dateparser.parse(text, settings=DATEPARSER_SETTINGS)
+    parsed_date = _dateparser_parse(text)
 
     if parsed_date:
         # If parsed but has no specific time, set to start of day
@@ -1446,12 +1599,16 @@ def _parse_date_only(text: str) -> datetime:
 
         # Ensure the date has timezone
         if parsed_date.tzinfo is None:
-            parsed_date = pytz.timezone('America/Argentina/Buenos_Aires').localize(parsed_date)
+            parsed_date = parsed_date.replace(tzinfo=db.BA_TZ)
 
         return parsed_date
 
     return None
 
+def _cut_match(text: str, match: re.Match) -> str:
+    """Remove a matched span from text, joining both sides with a single space."""
+    return (text[:match.start()].rstrip() + ' ' + text[match.end():].lstrip()).strip()
+
 def extract_date_and_text(text: str):
     """Extract date/time and reminder text."""
 
@@ -1459,147 +1616,94 @@ def extract_date_and_text(text: str):
     text = text.strip()
 
     # Remove command words if they exist
-    text = re.sub(r'^\/(?:recordar)\s*', '', text, flags=re.IGNORECASE)
+    text = _COMMAND_RE.sub('', text)
 
     # Remove request words
-    request_words = [
-        'recordame', 'recordar', 'avisame', 'aviso', 'haceme acordar',
-        'acordar', 'que', 'de que', 'de'
-    ]
+    text = _REQUEST_WORDS_RE.sub('', text)
 
-    for word in request_words:
-        text = re.sub(rf'\b{word}\b', '', text, flags=re.IGNORECASE)
+    text = ' '.join(text.split())
 
-    text = re.sub(r'\s+', ' ', text).strip()
+    # No digits or date words: none of the patterns can match, go straight to dateparser
+    if not _DATE_HINT_RE.search(text):
+        parsed_date = _dateparser_parse(text)
+        if parsed_date:
+            return parsed_date, "recordatorio"
+        return None, None
 
     # Get current time for smart inference
-    now = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires'))
-
-    # Smart patterns for intuitive date parsing
-    smart_patterns = [
-        # "el lunes 29" or "lunes 29" (weekday + day) - HIGHER PRIORITY
-        (r'\b(?:el\s+)?(lunes|martes|miercoles|jueves|viernes|sabado|domingo)\s+(\d{1,2})\b', lambda m: _smart_weekday_day_parse(m.group(1), int(m.group(2)), now)),
-        # "el lunes que viene" or "lunes que viene" - HIGHER PRIORITY
-        (r'\b(?:el\s+)?(lunes|martes|miercoles|jueves|viernes|sabado|domingo)\s+que\s+viene\b', lambda m: _smart_next_weekday_parse(m.group(1), now)),
-        # "el 20" (day of current month/year)
-        (r'\bel\s+(\d{1,2})\b(?![\/\-:])', lambda m: _smart_day_parse(int(m.group(1)), now)),
-        # "el 20/12" or "20/12" (day/month of current year)
-        (r'\b(?:el\s+)?(\d{1,2})[\/\-](\d{1,2})\b(?![\-:])', lambda m: _smart_date_parse(int(m.group(1)), int(m.group(2)), now)),
-        # "a las 9" (smart hour inference)
-        (r'\ba\s*las?\s+(\d{1,2})(?::(\d{2}))?\b', lambda m: _smart_hour_parse(int(m.group(1)), int(m.group(2)) if m.group(2) else 0, now))
-    ]
-
-    for pattern, calc_func in smart_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            datetime_obj = calc_func(match)
-            if datetime_obj:
-                clean_text = re.sub(pattern, '', text, flags=re.IGNORECASE).strip()
-
-                # After finding a date, check if there's time info in remaining text
-                time_match = re.search(r'\ba\s*las?\s+(\d{1,2})(?::(\d{2}))?\b', clean_text, re.IGNORECASE)
-                if time_match:
-                    hour = int(time_match.group(1))
-                    minute = int(time_match.group(2)) if time_match.group(2) else 0
-
-                    # Apply smart hour parsing if needed
-                    if hour <= 12:
-                        # Use the same smart hour logic
-                        time_obj = _smart_hour_parse(hour, minute, datetime_obj)
-                        if time_obj:
-                            # Replace the date part but keep the time from smart parsing
-                            datetime_obj = datetime_obj.replace(hour=time_obj.hour, minute=time_obj.minute)
-                    else:
-                        # Hour is already in 24h format
-                        datetime_obj = datetime_obj.replace(hour=hour, minute=minute)
-
-                    # Remove time pattern from clean text
-                    clean_text = re.sub(r'\ba\s*las?\s+\d{1,2}(?::\d{2})?\b', '', clean_text, flags=re.IGNORECASE).strip()
+    now = datetime.now(db.BA_TZ)
+
+    # Smart patterns for intuitive date parsing (tried in priority order, only if one of them matches at all)
+    datetime_obj, match = None, None
+    if _SMART_ANY_RE.search(text):
+        datetime_obj, match = _try_smart_patterns(_SMART_PATTERNS, text, now)
+    if datetime_obj:
+        clean_text = _cut_match(text, match)
+
+        # After finding a date, check if there's time info in remaining text
+        time_match = _HOUR_RE.search(clean_text)
+        if time_match:
+            hour = int(time_match.group(1))
+            minute = int(time_match.group(2)) if time_match.group(2) else 0
+
+            # Apply smart hour parsing if needed
+            if hour <= 12:
+                # Use the same smart hour logic
+                time_obj = _smart_hour_parse(hour, minute, datetime_obj)
+                if time_obj:
+                    # Replace the date part but keep the time from smart parsing
+                    datetime_obj = datetime_obj.replace(hour=time_obj.hour, minute=time_obj.minute)
+            else:
+                # Hour is already in 24h format
+                datetime_obj = datetime_obj.replace(hour=hour, minute=minute)
 
-                return datetime_obj, clean_text
+            # Remove time pattern from clean text
+            clean_text = _cut_match(clean_text, time_match)
 
-    # Helper function to convert Spanish number words to digits
-    def spanish_word_to_number(word):
-        word_numbers = {
-            'una': 1, 'un': 1, 'uno': 1,
-            'dos': 2, 'tres': 3, 'cuatro': 4, 'cinco': 5,
-            'seis': 6, 'siete': 7, 'ocho': 8, 'nueve': 9,
-            'diez': 10, 'media': 0.5
-        }
-        return word_numbers.get(word.lower())
+        return datetime_obj, clean_text
 
     # Relative time patterns
-    relative_patterns = [
-        # Spanish number words for relative time
-        (r'en\s+(una?|dos|tres|cuatro|cinco|seis|siete|ocho|nueve|diez|media)\s*h(?:oras?)?',
-         lambda m: now + timedelta(hours=spanish_word_to_number(m.group(1)))),
-        (r'en\s+(una?|dos|tres|cuatro|cinco|seis|siete|ocho|nueve|diez|media)\s*m(?:in)?(?:utos?)?',
-         lambda m: now + timedelta(minutes=spanish_word_to_number(m.group(1)))),
-        # Numeric patterns
-        (r'en\s+(\d+)\s*m(?:in)?(?:utos?)?', lambda m: now + timedelta(minutes=int(m.group(1)))),
-        (r'en\s+(\d+)\s*h(?:oras?)?', lambda m: now + timedelta(hours=int(m.group(1)))),
-        (r'en\s+(\d+)\s*d(?:ias?)?', lambda m: now + timedelta(days=int(m.group(1))))
-    ]
-
-    for pattern, calc_func in relative_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern, calc_func in _RELATIVE_PATTERNS:
+        match = pattern.search(text)
         if match:
-            datetime_obj = calc_func(match)
-            clean_text = re.sub(pattern, '', text, flags=re.IGNORECASE).strip()
+            datetime_obj = calc_func(match, now)
+            clean_text = _cut_match(text, match)
             return datetime_obj, clean_text
 
     # Try with dateparser
-    # First try simple date patterns without specific time
-    date_patterns_no_time = [
-        r'\b(?:mañana|tomorrow)\b',
-        r'\b(?:el\s+)?(?:lunes|martes|miercoles|jueves|viernes|sabado|domingo)\b',
-        r'\b(?:hoy|today)\b'
-    ]
-
-    # Search for specific date/time patterns (excluding those handled by smart patterns)
-    date_patterns = [
-        r'\b(?:mañana|tomorrow)\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?|\d{1,2}\s*de\s*la\s*(?:mañana|tarde|noche)|antes\s*de\s*las?\s*\d{1,2})',
-        r'\b(?:el\s+)?(?:lunes|martes|miercoles|jueves|viernes|sabado|domingo)\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?)',
-        r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?)?',  # Full dates with year
-        r'\b\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:\d{2}\b',
-        r'\b(?:hoy|today)\b.*?(?:\d{1,2}:\d{2}|\d{1,2}hs?)',
-        r'\bantes\s*de\s*las?\s*\d{1,2}(?::\d{2})?\b',
-        r'\b\d{1,2}:\d{2}\b'
-    ]
-
     date_text = None
     remaining_text = text
     use_default_time = False
 
     # First search for patterns with specific time
-    for pattern in date_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             date_text = match.group(0)
             # Process "antes de las X"
             if "antes de las" in date_text.lower():
                 # Extract the hour from "antes de las X"
-                hour_match = re.search(r'(\d{1,2})(?::\d{2})?', date_text)
+                hour_match = _ANTES_HOUR_RE.search(date_text)
                 if hour_match:
                     hour = int(hour_match.group(1))
                     # If it says "antes de las 5 de la tarde", convert to 17:00
                     if "tarde" in text.lower() and hour <= 12:
                         hour += 12
                     # Create new date with specific time
-                    base_date = re.search(r'\b(?:mañana|tomorrow|hoy|today)\b', date_text, re.IGNORECASE)
+                    base_date = _BASE_DATE_RE.search(date_text)
                     if base_date:
                         if base_date.group(0).lower() in ['mañana', 'tomorrow']:
-                            date_base = (datetime.now(pytz.timezone('America/Argentina/Buenos_Aires')) + timedelta(days=1)).strftime('%Y-%m-%d')
+                            date_base = (now + timedelta(days=1)).strftime('%Y-%m-%d')
                         else:
-                            date_base = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires')).strftime('%Y-%m-%d')
+                            date_base = now.strftime('%Y-%m-%d')
                         date_text = f"{date_base} {hour-1}:00"  # One hour before
             remaining_text = text.replace(match.group(0), '').strip()
             break
 
     # If no pattern with time was found, search for date only
     if not date_text:
-        for pattern in date_patterns_no_time:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DATE_PATTERNS_NO_TIME:
+            match = pattern.search(text)
             if match:
                 date_text = match.group(0)
                 remaining_text = text.replace(date_text, '').strip()
@@ -1608,14 +1712,14 @@ def extract_date_and_text(text: str):
 
     if not date_text:
         # Try parsing the entire text
-        parsed_date = dateparser.parse(text, settings=DATEPARSER_SETTINGS)
+        parsed_date = _dateparser_parse(text)
         if parsed_date:
             # If it parses everything, assume no additional text
             return parsed_date, "recordatorio"
         return None, None
 
     # Parse the found date
-    parsed_date = dateparser.parse(date_text, settings=DATEPARSER_SETTINGS)
+    parsed_date = _fast_parse(date_text, now) or _dateparser_parse(date_text)
 
     # If parsed but has no specific time, add 9am by default
     if parsed_date and use_default_time:
@@ -1626,10 +1730,10 @@ def extract_date_and_text(text: str):
 
     # Ensure the date has timezone
     if parsed_date.tzinfo is None:
-        parsed_date = pytz.timezone('America/Argentina/Buenos_Aires').localize(parsed_date)
+        parsed_date = parsed_date.replace(tzinfo=db.BA_TZ)
 
     # Clean remaining text
-    remaining_text = re.sub(r'^\s*que\s+', '', remaining_text, flags=re.IGNORECASE)
+    remaining_text = _LEADING_QUE_RE.sub('', remaining_text)
     remaining_text = remaining_text.strip()
 
     if not remaining_text:
@@ -1655,23 +1759,21 @@ async def important_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Parse arguments
     args = context.args
-    text = ' '.join(args)
 
     # Check if first argument is a number (repeat interval)
     repeat_interval = 5  # Default 5 minutes
     start_index = 0
 
-    try:
-        # If first argument is a number, use it as repeat interval
-        if args[0].isdigit():
-            repeat_interval = int(args[0])
-            if repeat_interval < 1 or repeat_interval > 60:
-                await update.message.reply_text("❌ El intervalo debe ser entre 1 y 60 minutos.")
-                return
-            start_index = 1
-            text = ' '.join(args[1:])
-    except (ValueError, IndexError):
-        pass
+    # If first argument is a number, use it as repeat interval
+    # (isdecimal accepts exactly the digit strings int() can parse)
+    if args[0].isdecimal():
+        repeat_interval = int(args[0])
+        if repeat_interval < 1 or repeat_interval > 60:
+            await update.message.reply_text("❌ El intervalo debe ser entre 1 y 60 minutos.")
+            return
+        start_index = 1
+
+    text = ' '.join(args[start_index:])
 
     if not text.strip():
         await update.message.reply_text("❌ Debes especificar el texto del recordatorio.")
@@ -1697,14 +1799,8 @@ async def process_important_reminder(update: Update, context: ContextTypes.DEFAU
             )
             return
 
-        # Extract category if present
-        remaining_text, explicit_category = extract_explicit_category(remaining_text)
-
-        # Capitalize first letter
-        remaining_text = capitalize_first_letter(remaining_text)
-
-        # Use explicit category or extract from text
-        category = explicit_category if explicit_category else extract_category_from_text(remaining_text)
+        # Strip explicit category, capitalize and categorize
+        remaining_text, category = prepare_entry_text(remaining_text)
 
         # Create important reminder in database
         reminder_id = db.add_important_reminder(
@@ -1841,7 +1937,6 @@ async def repeat_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if new_reminder_id:
         # Schedule the new reminder
-        import scheduler
         if original_reminder['is_important']:
             scheduler.schedule_important_reminder(
                 new_reminder_id,
@@ -2358,24 +2453,25 @@ def normalize_girlfriend_answer(text: str) -> str:
     if not text:
         return ""
 
-    # Convert to lowercase
-    normalized = text.lower()
+    # Convert to lowercase, then remove accents/diacritics (combining marks left behind by NFD)
+    return unicodedata.normalize('NFD', text.lower()).translate(db._NONSPACING_MARKS)
 
-    # Remove accents/diacritics using unicodedata
-    normalized = unicodedata.normalize('NFD', normalized)
-    normalized = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+# Required words from "oh mi amor estás maravillosa hoy"
+_GIRLFRIEND_REQUIRED_WORDS = ('oh', 'mi', 'amor', 'estas', 'maravillosa', 'hoy')
 
-    return normalized
+# Length of the shortest text containing every required word ("ohoymiestasmaravillosamor");
+# normalizing never turns one character into two letters, so shorter answers can't match
+_GIRLFRIEND_MIN_ANSWER_LENGTH = 25
 
 def validate_girlfriend_answer(text: str) -> bool:
     """Check if the answer contains the required romantic phrase."""
-    normalized_text = normalize_girlfriend_answer(text)
+    if not text or len(text) < _GIRLFRIEND_MIN_ANSWER_LENGTH:
+        return False
 
-    # Required words from "oh mi amor estás maravillosa hoy"
-    required_words = ['oh', 'mi', 'amor', 'estas', 'maravillosa', 'hoy']
+    normalized_text = normalize_girlfriend_answer(text)
 
     # Check if all required words are present (order doesn't matter)
-    return all(word in normalized_text for word in required_words)
+    return all(word in normalized_text for word in _GIRLFRIEND_REQUIRED_WORDS)
 
 async def process_girlfriend_validation(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process girlfriend validation answer."""
@@ -2408,6 +2504,41 @@ async def process_girlfriend_validation(update: Update, context: ContextTypes.DE
     # Clear the validation flag
     context.user_data.pop('pending_girlfriend_validation', None)
 
+# Romantic fortune messages for /fortuna
+# DEV NOTES: Modify this messages to be more personal
+_ROMANTIC_FORTUNES = (
+    "Hoy alguien que te ama piensa en vos más de lo normal 💕",
+    "Tu sonrisa va a iluminar el día de alguien especial ✨",
+    "Algo hermoso te espera hoy, y yo también 😘",
+    "El universo conspira para que tengás un día perfecto 🌟",
+    "Hoy vas a recibir una sorpresa de quien más te ama 💖",
+    "Tu felicidad es el regalo más lindo que existe 🎁",
+    "Alguien está pensando en abrazarte en este momento 🤗",
+    "Hoy es un día perfecto para ser la persona más linda del mundo 👑",
+    "Tu risa va a ser la melodía más bella de hoy 🎵",
+    "Algo mágico va a pasar hoy, y vos sos la magia ✨",
+    "El amor verdadero te rodea todo el tiempo 💕",
+    "Hoy vas a brillar más que las estrellas 🌟",
+    "Alguien te extraña muchísimo ahora mismo 💔💕",
+    "Tu corazón va a estar lleno de alegría hoy 💖",
+    "Hoy es el día perfecto para ser mimada 🥰",
+    "La suerte está de tu lado, especialmente en el amor 🍀💕",
+    "Algo dulce te espera al final del día 🍯",
+    "Tu belleza interior y exterior brillan hoy 💎",
+    "Alguien está escribiendo tu nombre en las estrellas ⭐",
+    "Hoy vas a hacer que alguien se sienta el más afortunado 🎰💕",
+    "El día tiene preparado algo especial para vos 🌈",
+    "Tu energía positiva va a contagiar a todos 🌞",
+    "Alguien cuenta los minutos hasta verte 🕐💕",
+    "Hoy vas a recibir todo el amor que merecés 💖",
+    "La vida te va a sorprender con algo hermoso 🌺",
+    "Tu presencia hace que todo sea mejor 💫",
+    "Hoy alguien va a decirte lo importante que sos 💕",
+    "El amor que das vuelve a vos multiplicado 💞",
+    "Hoy es tu día para brillar como la estrella que sos ⭐",
+    "Algo que esperás va a llegar pronto 🙏💕",
+)
+
 async def fortune_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the /fortuna command - romantic fortune messages for girlfriend."""
     # Register or update user
@@ -2422,44 +2553,8 @@ async def fortune_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    # Romantic fortune messages
-    # DEV NOTES: Modify this messages to be more personal
-    romantic_fortunes = [
-        "Hoy alguien que te ama piensa en vos más de lo normal 💕",
-        "Tu sonrisa va a iluminar el día de alguien especial ✨",
-        "Algo hermoso te espera hoy, y yo también 😘",
-        "El universo conspira para que tengás un día perfecto 🌟",
-        "Hoy vas a recibir una sorpresa de quien más te ama 💖",
-        "Tu felicidad es el regalo más lindo que existe 🎁",
-        "Alguien está pensando en abrazarte en este momento 🤗",
-        "Hoy es un día perfecto para ser la persona más linda del mundo 👑",
-        "Tu risa va a ser la melodía más bella de hoy 🎵",
-        "Algo mágico va a pasar hoy, y vos sos la magia ✨",
-        "El amor verdadero te rodea todo el tiempo 💕",
-        "Hoy vas a brillar más que las estrellas 🌟",
-        "Alguien te extraña muchísimo ahora mismo 💔💕",
-        "Tu corazón va a estar lleno de alegría hoy 💖",
-        "Hoy es el día perfecto para ser mimada 🥰",
-        "La suerte está de tu lado, especialmente en el amor 🍀💕",
-        "Algo dulce te espera al final del día 🍯",
-        "Tu belleza interior y exterior brillan hoy 💎",
-        "Alguien está escribiendo tu nombre en las estrellas ⭐",
-        "Hoy vas a hacer que alguien se sienta el más afortunado 🎰💕",
-        "El día tiene preparado algo especial para vos 🌈",
-        "Tu energía positiva va a contagiar a todos 🌞",
-        "Alguien cuenta los minutos hasta verte 🕐💕",
-        "Hoy vas a recibir todo el amor que merecés 💖",
-        "La vida te va a sorprender con algo hermoso 🌺",
-        "Tu presencia hace que todo sea mejor 💫",
-        "Hoy alguien va a decirte lo importante que sos 💕",
-        "El amor que das vuelve a vos multiplicado 💞",
-        "Hoy es tu día para brillar como la estrella que sos ⭐",
-        "Algo que esperás va a llegar pronto 🙏💕"
-    ]
-
     # Select a random fortune
-    import random
-    selected_fortune = random.choice(romantic_fortunes)
+    selected_fortune = random.choice(_ROMANTIC_FORTUNES)
 
     # Send the fortune with romantic formatting
     await update.message.reply_text(
@@ -2499,9 +2594,13 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Mark this chat as pending admin validation
     context.user_data['pending_admin_validation'] = True
 
+# Digest of the admin password, compared in constant time so response timing leaks nothing
+_ADMIN_PASSWORD_DIGEST = hashlib.sha256(b"admin6143").digest()
+
 def validate_admin_password(password: str) -> bool:
     """Check if the admin password is correct."""
-    return password.strip() == "admin6143"
+    digest = hashlib.sha256(password.strip().encode('utf-8', 'surrogatepass')).digest()
+    return hmac.compare_digest(digest, _ADMIN_PASSWORD_DIGEST)
 
 async def process_admin_validation(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process admin validation password."""
@@ -2589,8 +2688,6 @@ async def surprise_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Send the photo from local file
     try:
-        import os
-
         local_file_path = random_photo['local_file_path']
 
         # Check if file exists
@@ -2654,12 +2751,11 @@ async def surprise_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "¡Pero el amor está ahí! Intenta de nuevo 💕"
         )
 
+# Gallery file ids: a counter seeded with the start time in ms, so ids keep growing across restarts
+_upload_counter = itertools.count(int(time.time() * 1000))
+
 async def handle_surprise_upload(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle photo/document uploads for secret gallery when admin is in upload mode."""
-    import os
-    import uuid
-    from pathlib import Path
-
     chat_id = update.effective_chat.id
 
     logger.info(f"Handle surprise upload called for chat_id: {chat_id}")
@@ -2682,6 +2778,7 @@ async def handle_surprise_upload(update: Update, context: ContextTypes.DEFAULT_T
     file_type = None
     original_filename = None
     description = update.message.caption or ""
+    upload_id = f"{next(_upload_counter):x}"
 
     # Determine file type and get file object
     logger.info(f"Message content - Photo: {bool(update.message.photo)}, Document: {bool(update.message.document)}, Sticker: {bool(update.message.sticker)}")
@@ -2691,24 +2788,24 @@ async def handle_surprise_upload(update: Update, context: ContextTypes.DEFAULT_T
         file_obj = await update.message.photo[-1].get_file()  # Get highest quality photo
         file_type = 'photo'
         file_extension = '.jpg'
-        original_filename = f"photo_{uuid.uuid4().hex[:8]}.jpg"
+        original_filename = f"photo_{upload_id}.jpg"
     elif update.message.document:
         logger.info(f"Processing document upload: {update.message.document.file_name}")
         file_obj = await update.message.document.get_file()
         file_type = 'document'
-        original_filename = update.message.document.file_name or f"document_{uuid.uuid4().hex[:8]}"
+        original_filename = update.message.document.file_name or f"document_{upload_id}"
         file_extension = Path(original_filename).suffix or '.bin'
     elif update.message.sticker:
         logger.info(f"Processing sticker upload")
         file_obj = await update.message.sticker.get_file()
         file_type = 'sticker'
         file_extension = '.webp'
-        original_filename = f"sticker_{uuid.uuid4().hex[:8]}.webp"
+        original_filename = f"sticker_{upload_id}.webp"
 
     if file_obj:
         try:
             # Create unique filename
-            unique_filename = f"{uuid.uuid4().hex}{file_extension}"
+            unique_filename = f"{chat_id}_{upload_id}{file_extension}"
             local_file_path = os.path.join(db.GALLERY_PATH, unique_filename)
 
             # Download and save file locally
@@ -2769,20 +2866,24 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text("❌ No se pudo obtener la información del usuario.")
             return
 
-        # Get all reminders (active, sent, cancelled)
-        all_reminders = db.get_all_reminders_for_export(chat_id)
-
-        # Get all vault entries (active and deleted)
-        all_vault_entries = db.get_all_vault_entries_for_export(chat_id)
+        # Get all reminders (active, sent, cancelled) and all vault entries (active and deleted);
+        # these read the user's whole history, so run them side by side off the event loop
+        all_reminders, all_vault_entries = await asyncio.gather(
+            asyncio.to_thread(db.get_all_reminders_for_export, chat_id),
+            asyncio.to_thread(db.get_all_vault_entries_for_export, chat_id)
+        )
 
         # Check if user wants to include history
         include_history = False
         if context.args and len(context.args) > 0:
             include_history = context.args[0].lower() in ['completo', 'historial', 'todo', 'full']
 
-        # Generate PDF
+        # Generate PDF (reportlab is only loaded once someone actually exports)
+        from pdf_exporter import PDFExporter, cleanup_temp_file
         exporter = PDFExporter()
-        pdf_path = exporter.generate_export_pdf(
+        # Building the PDF is slow, blocking work: run it off the event loop so other chats keep being served
+        pdf_path = await asyncio.to_thread(
+            exporter.generate_export_pdf,
             chat_id=chat_id,
             user_info=user_info,
             reminders=all_reminders,
@@ -2791,8 +2892,8 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
 
         # Send the PDF file
+        filename = f"exportacion_datos_{chat_id}_{time.strftime('%Y%m%d_%H%M%S')}.pdf"
         with open(pdf_path, 'rb') as pdf_file:
-            filename = f"exportacion_datos_{chat_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
             await context.bot.send_document(
                 chat_id=chat_id,
                 document=pdf_file,
@@ -2821,6 +2922,11 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "❌ Error generando la exportación. Intenta nuevamente en unos momentos."
         )
 
+# Keywords that mark a transcribed voice message as a vault note or a reminder
+_VOICE_VAULT_KEYWORDS_RE = re.compile(r'recordar que|acordarme que|nota que|apuntar que|guardar que|anotá')
+_VOICE_VAULT_WORDS_RE = re.compile(r'\b(?:recordar que|acordarme que|nota que|apuntar que|guardar que|anotá)\b', re.IGNORECASE)
+_VOICE_REMINDER_KEYWORDS_RE = re.compile(r'recordar|recordame|aviso|avisame|haceme acordar|acordar')
+
 async def voice_message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle voice messages and transcribe them."""
     if not update.message.voice:
@@ -2836,7 +2942,8 @@ async def voice_message_handler(update: Update, context: ContextTypes.DEFAULT_TY
         # Get the voice file
         voice_file = await context.bot.get_file(update.message.voice.file_id)
 
-        # Transcribe the voice message
+        # Transcribe the voice message (the OpenAI client is only set up on first use)
+        from transcription import transcriber
         transcribed_text = await transcriber.download_and_transcribe(voice_file, context.bot)
 
         if not transcribed_text:
@@ -2853,31 +2960,20 @@ async def voice_message_handler(update: Update, context: ContextTypes.DEFAULT_TY
         text_lower = transcribed_text.lower()
 
         # Check if it's a vault entry (keywords that suggest it's a note)
-        vault_keywords = ['recordar que', 'acordarme que', 'nota que', 'apuntar que', 'guardar que', 'anotá']
-        if any(keyword in text_lower for keyword in vault_keywords):
+        if _VOICE_VAULT_KEYWORDS_RE.search(text_lower):
             # Remove vault keywords and save to vault
-            clean_text = transcribed_text
-            for keyword in vault_keywords:
-                clean_text = re.sub(rf'\b{keyword}\b', '', clean_text, flags=re.IGNORECASE)
-            clean_text = clean_text.strip()
+            clean_text = _VOICE_VAULT_WORDS_RE.sub('', transcribed_text).strip()
 
             if clean_text:
-                # Extract explicit category if present
-                clean_text, explicit_category = extract_explicit_category(clean_text)
-
-                # Capitalize first letter
-                clean_text = capitalize_first_letter(clean_text)
+                # Strip explicit category, capitalize and categorize
+                clean_text, category = prepare_entry_text(clean_text)
                 chat_id = update.effective_chat.id
-
-                # Use explicit category or extract from text
-                category = explicit_category if explicit_category else extract_category_from_text(clean_text)
                 vault_id = db.add_vault_entry(chat_id, clean_text, category)
                 await update.message.reply_text(f"📖 Guardado en la bitácora (#{vault_id}): \"{clean_text}\" [#{category}]")
             return
 
         # Check if it's a reminder attempt
-        reminder_keywords = ['recordar', 'recordame', 'aviso', 'avisame', 'haceme acordar', 'acordar']
-        if any(keyword in text_lower for keyword in reminder_keywords):
+        if _VOICE_REMINDER_KEYWORDS_RE.search(text_lower):
             await process_reminder(update, context, transcribed_text)
         else:
             # If it doesn't match any pattern, suggest what they can do
@@ -2893,11 +2989,24 @@ async def voice_message_handler(update: Update, context: ContextTypes.DEFAULT_TY
             "❌ Ocurrió un error procesando el mensaje de voz. Intenta nuevamente."
         )
 
+# Error replies still in flight (asyncio only keeps weak references to tasks)
+_pending_error_replies = set()
+
+def _error_reply_done(task: asyncio.Task):
+    """Forget a finished error reply, logging it if it failed too."""
+    _pending_error_replies.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Error sending error reply: {task.exception()}")
+
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
     """Handle bot errors."""
     logger.error(f"Error: {context.error}")
 
     if isinstance(update, Update) and update.effective_message:
-        await update.effective_message.reply_text(
+        # Don't hold up update processing on the reply: if the error was a network
+        # problem, it may take as long to fail as the original request did
+        task = asyncio.create_task(update.effective_message.reply_text(
             "❌ Ocurrió un error. Intenta nuevamente."
-        )
\ No newline at end of file
+        ))
+        _pending_error_replies.add(task)
+        task.add_done_callback(_error_reply_done)
\ No newline at end of file
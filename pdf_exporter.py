@@ -7,7 +7,6 @@ import os
 import tempfile
 from datetime import datetime
 from typing import List, Dict
-import pytz
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -15,6 +14,7 @@ from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.platypus.flowables import HRFlowable
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+import db
 
 
 class PDFExporter:
@@ -119,8 +119,7 @@ class PDFExporter:
 
     def _build_header(self, user_info: Dict) -> List:
         """Build the PDF header section."""
-        timezone = pytz.timezone('America/Argentina/Buenos_Aires')
-        now = datetime.now(timezone)
+        now = datetime.now(db.BA_TZ)
 
         story = []
 
@@ -3,13 +3,12 @@ from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 import logging
 from datetime import datetime, timedelta
-import pytz
 from telegram import Bot
 import db
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler(timezone=pytz.timezone('America/Argentina/Buenos_Aires'))
+scheduler = AsyncIOScheduler(timezone=db.BA_TZ)
 
 def init_scheduler():
     """Initialize the scheduler."""
@@ -134,7 +133,7 @@ def load_pending_reminders(bot: Bot):
     """Load all pending reminders when restarting the bot."""
     # Load regular reminders
     reminders = db.get_all_active_reminders()
-    now = datetime.now(pytz.timezone('America/Argentina/Buenos_Aires'))
+    now = datetime.now(db.BA_TZ)
 
     regular_count = 0
     for reminder in reminders: